@@ -0,0 +1,32 @@
+from django.conf import settings
+from django.core.cache import cache
+
+from accounts.models import Token, User
+
+
+def user_cache_key(email):
+    return f'accounts:user:{email}'
+
+
+class PasswordlessAuthenticationBackend(object):
+
+    def authenticate(self, request, uid=None):
+        email = Token.objects.consume(uid)
+        if email is None:
+            return None
+        user, _ = User.objects.get_or_create(email=email)
+        return user
+
+    def get_user(self, email):
+        # called on every request from a logged-in session, so cache the
+        # user; accounts.signals drops the entry when the user changes
+        key = user_cache_key(email)
+        user = cache.get(key)
+        if user is not None:
+            return user
+        try:
+            user = User.objects.get(email=email)
+        except User.DoesNotExist:
+            return None
+        cache.set(key, user, settings.USER_CACHE_TIMEOUT)
+        return user
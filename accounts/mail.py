@@ -0,0 +1,99 @@
+import logging
+import queue
+import threading
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import close_old_connections
+
+from accounts.models import Token
+
+logger = logging.getLogger(__name__)
+
+SUBJECT = 'Your login link for Superlists'
+BODY = 'Use this link to log in:\n\n{url}'
+
+# how long a worker waits for more requests to join a batch
+BATCH_WINDOW = 0.05
+
+
+def deliver(batch):
+    """Create a token for each (email, login_url) and send all the login
+    emails over a single mail connection. A message that cannot be sent is
+    logged and skipped, so it does not hold back the rest of the batch."""
+    tokens = Token.objects.bulk_create(Token(email=email) for email, _ in batch)
+    messages = [
+        EmailMessage(
+            SUBJECT,
+            BODY.format(url=f'{login_url}?token={token.uid}'),
+            settings.DEFAULT_FROM_EMAIL,
+            [token.email],
+        )
+        for token, (_, login_url) in zip(tokens, batch)
+    ]
+    with get_connection() as connection:
+        for message in messages:
+            try:
+                connection.send_messages([message])
+            except Exception:
+                logger.exception('Failed to send a login email to %r', message.to[0])
+
+
+class LoginMailer:
+    """Sends login emails from a small pool of background threads so the
+    request that asked for one returns straight away. Requests queue up to
+    LOGIN_MAIL_QUEUE_SIZE; once the queue is full they are sent inline,
+    which slows the caller down instead of dropping the email."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.queue = None
+
+    def start(self):
+        with self.lock:
+            if self.queue is not None:
+                return
+            self.queue = queue.Queue(maxsize=settings.LOGIN_MAIL_QUEUE_SIZE)
+            for n in range(settings.LOGIN_MAIL_WORKERS):
+                threading.Thread(
+                    target=self.work, name=f'login-mailer-{n}', daemon=True
+                ).start()
+
+    def submit(self, email, login_url):
+        if not settings.LOGIN_MAIL_ASYNC:
+            deliver([(email, login_url)])
+            return
+        self.start()
+        try:
+            self.queue.put_nowait((email, login_url))
+        except queue.Full:
+            deliver([(email, login_url)])
+
+    def next_batch(self):
+        batch = [self.queue.get()]
+        while len(batch) < settings.LOGIN_MAIL_BATCH_SIZE:
+            try:
+                batch.append(self.queue.get(timeout=BATCH_WINDOW))
+            except queue.Empty:
+                break
+        return batch
+
+    def work(self):
+        while True:
+            batch = self.next_batch()
+            try:
+                deliver(batch)
+            except Exception:
+                logger.exception('Failed to send %d login emails', len(batch))
+            finally:
+                close_old_connections()
+                for _ in batch:
+                    self.queue.task_done()
+
+    def join(self):
+        """Block until every queued email has been handled."""
+        if self.queue is not None:
+            self.queue.join()
+
+
+mailer = LoginMailer()
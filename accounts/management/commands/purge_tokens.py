@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from accounts.models import Token
+
+BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = ('Deletes expired login tokens, BATCH_SIZE rows per transaction so '
+            'the table is never locked for long.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+
+    def handle(self, batch_size, **options):
+        deleted = 0
+        while True:
+            ids = list(
+                Token.objects.expired().order_by('created')
+                .values_list('id', flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            deleted += Token.objects.filter(id__in=ids).delete()[0]
+        self.stdout.write(f'Deleted {deleted} expired tokens')
@@ -1,7 +1,10 @@
+from datetime import timedelta
+
+from django.conf import settings
 from django.db import models
+from django.utils import timezone
 import uuid
 
-# Create your models here.
 
 class User(models.Model):
     email = models.EmailField(primary_key=True)
@@ -10,10 +13,31 @@ class User(models.Model):
     is_anonymous = False
     is_authenticated = True
 
+
+class TokenQuerySet(models.QuerySet):
+
+    def expired(self):
+        cutoff = timezone.now() - timedelta(seconds=settings.LOGIN_TOKEN_MAX_AGE)
+        return self.filter(created__lte=cutoff)
+
+    def unexpired(self):
+        cutoff = timezone.now() - timedelta(seconds=settings.LOGIN_TOKEN_MAX_AGE)
+        return self.filter(created__gt=cutoff)
+
+    def consume(self, uid):
+        """Delete the unexpired token with this uid and return its email, or
+        None. Of two concurrent calls for one token only one deletes it."""
+        tokens = self.unexpired().filter(uid=uid)
+        email = tokens.values_list('email', flat=True).first()
+        if email is None or not tokens.delete()[0]:
+            return None
+        return email
+
+
 class Token(models.Model):
     email = models.EmailField()
-    uid = models.TextField(default=uuid.uuid4, max_length=40)
+    uid = models.CharField(default=uuid.uuid4, max_length=40, unique=True)
+    created = models.DateTimeField(default=timezone.now, db_index=True)
     REQUIRED_FIELDS = []
 
-
-
+    objects = TokenQuerySet.as_manager()
@@ -0,0 +1,73 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from accounts.authentication import PasswordlessAuthenticationBackend
+from accounts.models import Token
+
+User = get_user_model()
+
+
+class AuthenticateTest(TestCase):
+
+    def test_returns_none_for_unknown_token(self):
+        backend = PasswordlessAuthenticationBackend()
+        self.assertIsNone(backend.authenticate(None, uid='no-such-token'))
+
+    def test_creates_user_for_new_email(self):
+        token = Token.objects.create(email='edith@example.com')
+        user = PasswordlessAuthenticationBackend().authenticate(None, token.uid)
+        self.assertEqual(user, User.objects.get(email='edith@example.com'))
+
+    def test_returns_existing_user(self):
+        existing = User.objects.create(email='edith@example.com')
+        token = Token.objects.create(email='edith@example.com')
+        user = PasswordlessAuthenticationBackend().authenticate(None, token.uid)
+        self.assertEqual(user, existing)
+
+
+class GetUserTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.backend = PasswordlessAuthenticationBackend()
+
+    def test_gets_user_by_email(self):
+        User.objects.create(email='other@example.com')
+        user = User.objects.create(email='edith@example.com')
+        self.assertEqual(self.backend.get_user('edith@example.com'), user)
+
+    def test_returns_none_for_unknown_email(self):
+        self.assertIsNone(self.backend.get_user('edith@example.com'))
+
+    def test_second_lookup_hits_the_cache(self):
+        User.objects.create(email='edith@example.com')
+        self.backend.get_user('edith@example.com')
+        with self.assertNumQueries(0):
+            user = self.backend.get_user('edith@example.com')
+        self.assertEqual(user.email, 'edith@example.com')
+
+    def test_deleting_user_invalidates_cache(self):
+        user = User.objects.create(email='edith@example.com')
+        self.backend.get_user('edith@example.com')
+        user.delete()
+        self.assertIsNone(self.backend.get_user('edith@example.com'))
+
+    def test_saving_user_invalidates_cache(self):
+        user = User.objects.create(email='edith@example.com')
+        self.backend.get_user('edith@example.com')
+        user.save()
+        with self.assertNumQueries(1):
+            self.backend.get_user('edith@example.com')
+
+    def test_logged_in_page_views_do_not_select_the_user(self):
+        self.client.force_login(User.objects.create(email='edith@example.com'))
+        self.client.get('/').wsgi_request.user.email
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/')
+            # request.user is lazy; load it while queries are captured
+            email = response.wsgi_request.user.email
+        self.assertEqual(email, 'edith@example.com')
+        self.assertFalse(
+            [q for q in queries if 'accounts_user' in q['sql']])
@@ -0,0 +1,116 @@
+import threading
+from unittest.mock import patch
+
+from django.core import mail
+from django.test import TestCase, override_settings
+from accounts.mail import LoginMailer, deliver
+from accounts.models import Token
+
+
+class DeliverTest(TestCase):
+
+    def test_creates_a_token_and_sends_a_link_per_address(self):
+        deliver([
+            ('a@example.com', 'http://testserver/accounts/login'),
+            ('b@example.com', 'http://testserver/accounts/login'),
+        ])
+        self.assertEqual(Token.objects.count(), 2)
+        self.assertEqual(
+            [message.to for message in mail.outbox],
+            [['a@example.com'], ['b@example.com']])
+        for message in mail.outbox:
+            token = Token.objects.get(email=message.to[0])
+            self.assertIn(f'?token={token.uid}', message.body)
+
+    def test_one_unsendable_message_does_not_stop_the_others(self):
+        with self.assertLogs('accounts.mail', 'ERROR'):
+            deliver([
+                ('bad@example.com\nBcc: x@example.com', 'http://x/'),
+                ('good@example.com', 'http://x/'),
+            ])
+        self.assertEqual(
+            [message.to for message in mail.outbox], [['good@example.com']])
+
+    def test_creates_tokens_in_one_query(self):
+        with self.assertNumQueries(1):
+            deliver([(f'{n}@example.com', 'http://x/') for n in range(10)])
+
+
+@override_settings(LOGIN_MAIL_WORKERS=1, LOGIN_MAIL_BATCH_SIZE=10)
+class LoginMailerTest(TestCase):
+
+    def test_submit_does_not_wait_for_delivery(self):
+        release = threading.Event()
+        batches = []
+
+        def slow_deliver(batch):
+            release.wait()
+            batches.append(batch)
+
+        mailer = LoginMailer()
+        with patch('accounts.mail.deliver', slow_deliver), \
+                patch('accounts.mail.close_old_connections'):
+            mailer.submit('a@example.com', 'http://x/')
+            self.assertEqual(batches, [])
+            release.set()
+            mailer.join()
+        self.assertEqual(batches, [[('a@example.com', 'http://x/')]])
+
+    def test_batches_queued_emails(self):
+        started = threading.Event()
+        release = threading.Event()
+        batches = []
+
+        def blocking_deliver(batch):
+            started.set()
+            release.wait()
+            batches.append(batch)
+
+        mailer = LoginMailer()
+        with patch('accounts.mail.deliver', blocking_deliver), \
+                patch('accounts.mail.close_old_connections'):
+            mailer.submit('first@example.com', 'http://x/')
+            started.wait()
+            for n in range(5):
+                mailer.submit(f'{n}@example.com', 'http://x/')
+            release.set()
+            mailer.join()
+        self.assertEqual([len(batch) for batch in batches], [1, 5])
+
+    @override_settings(LOGIN_MAIL_QUEUE_SIZE=1)
+    def test_sends_inline_when_queue_is_full(self):
+        started = threading.Event()
+        release = threading.Event()
+        worker_batches = []
+        inline_batches = []
+
+        def fake_deliver(batch):
+            if threading.current_thread().name.startswith('login-mailer'):
+                started.set()
+                release.wait()
+                worker_batches.append(batch)
+            else:
+                inline_batches.append(batch)
+
+        mailer = LoginMailer()
+        with patch('accounts.mail.deliver', fake_deliver), \
+                patch('accounts.mail.close_old_connections'):
+            mailer.submit('a@example.com', 'http://x/')
+            started.wait()
+            mailer.submit('b@example.com', 'http://x/')  # fills the queue
+            mailer.submit('c@example.com', 'http://x/')
+            release.set()
+            mailer.join()
+        self.assertEqual(inline_batches, [[('c@example.com', 'http://x/')]])
+        self.assertEqual(len(worker_batches), 2)
+
+    def test_worker_survives_delivery_errors(self):
+        mailer = LoginMailer()
+        with patch('accounts.mail.deliver', side_effect=[OSError, None]) as mock_deliver, \
+                patch('accounts.mail.close_old_connections'), \
+                self.assertLogs('accounts.mail', 'ERROR'):
+            mailer.submit('a@example.com', 'http://x/')
+            mailer.join()
+            mailer.submit('b@example.com', 'http://x/')
+            mailer.join()
+        self.assertEqual(mock_deliver.call_count, 2)
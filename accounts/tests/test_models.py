@@ -1,5 +1,11 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import IntegrityError
 from django.test import TestCase
 from django.contrib.auth import get_user_model
+from django.utils import timezone
 from accounts.models import Token
 
 User = get_user_model()
@@ -21,4 +27,38 @@ class TokenModelTest(TestCase):
     def test_links_user_with_auto_generated_uid(self):
         token1 = Token.objects.create(email='a@b.com')
         token2 = Token.objects.create(email='a@b.com')
-        self.assertNotEqual(token1.uid, token2.uid)
\ No newline at end of file
+        self.assertNotEqual(token1.uid, token2.uid)
+
+    def test_uid_is_unique(self):
+        token = Token.objects.create(email='a@b.com')
+        with self.assertRaises(IntegrityError):
+            Token.objects.create(email='c@d.com', uid=token.uid)
+
+
+class TokenConsumeTest(TestCase):
+
+    def test_returns_email_once(self):
+        token = Token.objects.create(email='a@b.com')
+        self.assertEqual(Token.objects.consume(token.uid), 'a@b.com')
+        self.assertIsNone(Token.objects.consume(token.uid))
+
+    def test_ignores_expired_tokens(self):
+        token = Token.objects.create(
+            email='a@b.com', created=timezone.now() - timedelta(hours=2))
+        self.assertIsNone(Token.objects.consume(token.uid))
+
+    def test_ignores_unknown_uid(self):
+        self.assertIsNone(Token.objects.consume('nope'))
+
+
+class PurgeTokensCommandTest(TestCase):
+
+    def test_deletes_only_expired_tokens_in_batches(self):
+        old = timezone.now() - timedelta(hours=2)
+        for n in range(5):
+            Token.objects.create(email=f'{n}@b.com', created=old)
+        fresh = Token.objects.create(email='new@b.com')
+        out = StringIO()
+        call_command('purge_tokens', batch_size=2, stdout=out)
+        self.assertEqual(list(Token.objects.all()), [fresh])
+        self.assertIn('Deleted 5 expired tokens', out.getvalue())
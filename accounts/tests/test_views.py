@@ -0,0 +1,66 @@
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.test import TestCase, override_settings
+from accounts.models import Token
+
+User = get_user_model()
+
+
+@override_settings(LOGIN_MAIL_ASYNC=False)
+class SendLoginEmailViewTest(TestCase):
+
+    def test_redirects_to_home_page(self):
+        response = self.client.post(
+            '/accounts/send_login_email', data={'email': 'edith@example.com'})
+        self.assertRedirects(response, '/')
+
+    def test_sends_login_link_to_address(self):
+        self.client.post(
+            '/accounts/send_login_email', data={'email': 'edith@example.com'})
+        self.assertEqual(len(mail.outbox), 1)
+        email = mail.outbox[0]
+        self.assertEqual(email.to, ['edith@example.com'])
+        token = Token.objects.get()
+        self.assertIn(
+            f'http://testserver/accounts/login?token={token.uid}', email.body)
+
+    def test_blank_email_sends_nothing(self):
+        self.client.post('/accounts/send_login_email', data={'email': ' '})
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_invalid_email_sends_nothing(self):
+        self.client.post('/accounts/send_login_email',
+                         data={'email': 'edith@example.com\nBcc: x@example.com'})
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(Token.objects.count(), 0)
+
+    @override_settings(LOGIN_MAIL_ASYNC=True)
+    @patch('accounts.views.mailer')
+    def test_hands_email_off_to_mailer(self, mock_mailer):
+        self.client.post(
+            '/accounts/send_login_email', data={'email': 'edith@example.com'})
+        mock_mailer.submit.assert_called_once_with(
+            'edith@example.com', 'http://testserver/accounts/login')
+
+
+class LoginViewTest(TestCase):
+
+    def test_logs_in_with_valid_token(self):
+        token = Token.objects.create(email='edith@example.com')
+        response = self.client.get(f'/accounts/login?token={token.uid}')
+        self.assertRedirects(response, '/')
+        self.assertEqual(self.client.session['_auth_user_id'], 'edith@example.com')
+        self.assertTrue(User.objects.filter(email='edith@example.com').exists())
+
+    def test_does_not_log_in_with_invalid_token(self):
+        self.client.get('/accounts/login?token=no-such-token')
+        self.assertNotIn('_auth_user_id', self.client.session)
+
+    def test_token_only_works_once(self):
+        token = Token.objects.create(email='edith@example.com')
+        self.client.get(f'/accounts/login?token={token.uid}')
+        self.client.logout()
+        self.client.get(f'/accounts/login?token={token.uid}')
+        self.assertNotIn('_auth_user_id', self.client.session)
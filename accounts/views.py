@@ -1,3 +1,27 @@
-from django.shortcuts import render
+from django.contrib import auth
+from django.core.exceptions import ValidationError
+from django.core.urlresolvers import reverse
+from django.core.validators import validate_email
+from django.shortcuts import redirect
+from django.views.decorators.http import require_POST
 
-# Create your views here.
+from accounts.mail import mailer
+
+
+@require_POST
+def send_login_email(request):
+    email = request.POST.get('email', '').strip()
+    try:
+        validate_email(email)
+    except ValidationError:
+        pass
+    else:
+        mailer.submit(email, request.build_absolute_uri(reverse('login')))
+    return redirect('/')
+
+
+def login(request):
+    user = auth.authenticate(request, uid=request.GET.get('token'))
+    if user is not None:
+        auth.login(request, user)
+    return redirect('/')
@@ -0,0 +1,19 @@
+"""Performance benchmarks for superlists.
+
+Each module is a script run from the project root, e.g.
+
+    python -m benchmarks.db_writes
+
+They set up Django themselves against throwaway databases, so they never
+touch db.sqlite3.
+"""
+import os
+
+
+def setup_django():
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'superlists.settings')
+    import django
+    from django.conf import settings
+    django.setup()
+    # the test client's default host
+    settings.ALLOWED_HOSTS = list(settings.ALLOWED_HOSTS) + ['testserver']
@@ -0,0 +1,47 @@
+"""Compare two benchmarks.latency result files:
+
+    python -m benchmarks.compare before.json after.json
+
+Prints the after/before ratio of p50, p95, queries and allocations for
+every scenario present in both, flagging slowdowns beyond --threshold.
+"""
+import argparse
+import json
+
+METRICS = ('p50_ms', 'p95_ms', 'queries', 'alloc_peak_kb')
+
+
+def load(path):
+    with open(path) as f:
+        data = json.load(f)
+    return data, {(r['scenario'], r['size']): r for r in data['results']}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('before')
+    parser.add_argument('after')
+    parser.add_argument('--threshold', type=float, default=1.10,
+                        help='ratio above which a metric counts as a regression')
+    args = parser.parse_args()
+
+    before_info, before = load(args.before)
+    after_info, after = load(args.after)
+    print(f"{before_info.get('revision')} -> {after_info.get('revision')}")
+    print(f"{'scenario':<10} {'size':>7} " + ' '.join(f'{m:>14}' for m in METRICS))
+    regressions = 0
+    for key in sorted(set(before) & set(after)):
+        cells = []
+        for metric in METRICS:
+            old, new = before[key][metric], after[key][metric]
+            ratio = new / old if old else (1.0 if not new else float('inf'))
+            flag = '!' if ratio > args.threshold else ' '
+            regressions += flag == '!'
+            cells.append(f'{ratio:>13.2f}{flag}')
+        print(f'{key[0]:<10} {key[1]:>7} ' + ' '.join(cells))
+    if regressions:
+        raise SystemExit(f'{regressions} metric(s) regressed')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""Item POST throughput against SQLite, with and without the connection
+tuning from superlists.db.
+
+    python -m benchmarks.db_writes --threads 8 --requests 100
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from benchmarks import setup_django
+
+
+def run(tuned, threads, requests):
+    from django.core.management import call_command
+    from django.db import connections
+    from django.db.backends.signals import connection_created
+    from django.test import Client
+    from lists.models import List
+    from superlists.db import tune_sqlite
+
+    if tuned:
+        connection_created.connect(tune_sqlite)
+    else:
+        connection_created.disconnect(tune_sqlite)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        connections.close_all()
+        connections.databases['default']['NAME'] = os.path.join(tmp, 'bench.sqlite3')
+        call_command('migrate', verbosity=0)
+        list_ids = [List.objects.create().id for _ in range(threads)]
+        connections.close_all()
+
+        errors = []
+
+        def post_items(list_id):
+            client = Client()
+            for n in range(requests):
+                try:
+                    status = client.post(
+                        f'/lists/{list_id}/', {'text': f'item {n}'}).status_code
+                except Exception:
+                    # the test client re-raises what would have been a 500
+                    status = 500
+                if status != 302:
+                    errors.append(status)
+            connections.close_all()
+
+        workers = [
+            threading.Thread(target=post_items, args=(list_id,))
+            for list_id in list_ids
+        ]
+        start = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - start
+        connections.close_all()
+    return threads * requests / elapsed, len(errors)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=100,
+                        help='POSTs per thread')
+    args = parser.parse_args()
+
+    os.environ['DJANGO_DB_CONN_MAX_AGE'] = '0'
+    setup_django()
+    for label, tuned in (('default journal', False), ('WAL + tuning', True)):
+        throughput, errors = run(tuned, args.threads, args.requests)
+        print(f'{label:>16}: {throughput:8.1f} POST/s, {errors} failed')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""Insert throughput and unique-index size for Item's per-list uniqueness
+constraint, enforced on the full text (schema before lists migration 0010)
+or on its SHA-256 digest (after), in throwaway SQLite databases.
+
+    python -m benchmarks.item_uniqueness --items 100000 --text-length 200
+"""
+import argparse
+import os
+import random
+import string
+import tempfile
+import time
+
+from benchmarks import setup_django
+
+SCHEMAS = (
+    ('full text', '0009_item_list_id_index', False),
+    ('text digest', '0010_item_text_digest', True),
+)
+
+
+def run(migration, digests, texts, per_list):
+    from django.core.management import call_command
+    from django.db import connection, connections, transaction
+    from lists.models import text_digest
+
+    with tempfile.TemporaryDirectory() as tmp:
+        connections.close_all()
+        connections.databases['default']['NAME'] = os.path.join(tmp, 'bench.sqlite3')
+        call_command('migrate', 'lists', migration, verbosity=0)
+        start = time.perf_counter()
+        with transaction.atomic(), connection.cursor() as cursor:
+            for offset in range(0, len(texts), per_list):
+                cursor.execute(
+                    "INSERT INTO lists_list (version, modified, item_count) "
+                    "VALUES (0, datetime('now'), 0)")
+                list_id = cursor.lastrowid
+                for text in texts[offset:offset + per_list]:
+                    if digests:
+                        cursor.execute(
+                            'INSERT INTO lists_item (list_id, text, text_digest, '
+                            "modified) VALUES (%s, %s, %s, datetime('now'))",
+                            [list_id, text, text_digest(text)])
+                    else:
+                        cursor.execute(
+                            'INSERT INTO lists_item (list_id, text, modified) '
+                            "VALUES (%s, %s, datetime('now'))", [list_id, text])
+        elapsed = time.perf_counter() - start
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT SUM(pgsize) FROM dbstat WHERE name LIKE 'lists_item_%_uniq'")
+            index_size = cursor.fetchone()[0]
+        connections.close_all()
+    return len(texts) / elapsed, index_size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--items', type=int, default=100000)
+    parser.add_argument('--text-length', type=int, default=200)
+    parser.add_argument('--per-list', type=int, default=100)
+    args = parser.parse_args()
+
+    setup_django()
+    rng = random.Random(0)
+    alphabet = string.ascii_lowercase + ' '
+    texts = [''.join(rng.choices(alphabet, k=args.text_length))
+             for _ in range(args.items)]
+    for label, migration, digests in SCHEMAS:
+        throughput, index_size = run(migration, digests, texts, args.per_list)
+        print(f'{label:>12}: {throughput:9.0f} inserts/s, '
+              f'unique index {index_size / 1024 / 1024:7.2f} MiB')
+
+
+if __name__ == '__main__':
+    main()
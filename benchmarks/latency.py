@@ -0,0 +1,241 @@
+"""In-process latency benchmark for the superlists URL surface.
+
+Drives home_page, new_list and view_list through the Django test client
+(or the bare WSGI handler with --handler wsgi) against a throwaway SQLite
+database, for lists of each --sizes, and reports p50/p95/p99 latency,
+queries per request and peak memory allocated per request:
+
+    python -m benchmarks.latency --sizes 10,1000,100000 --concurrency 4 \\
+        --output results.json
+
+Compare two result files with benchmarks.compare, e.g. to measure what the
+lean settings profile saves per request:
+
+    python -m benchmarks.latency --output full.json
+    DJANGO_LEAN=1 python -m benchmarks.latency --output lean.json
+    python -m benchmarks.compare full.json lean.json
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from urllib.parse import urlencode
+
+from benchmarks import setup_django
+
+Scenario = namedtuple('Scenario', 'name size method path data')
+
+
+def percentile(sorted_values, fraction):
+    index = max(0, int(round(fraction * len(sorted_values))) - 1)
+    return sorted_values[index]
+
+
+class ClientDriver:
+
+    def __init__(self):
+        from django.test import Client
+        self.client = Client()
+
+    def request(self, method, path, data):
+        if method == 'POST':
+            return self.client.post(path, data).status_code
+        return self.client.get(path).status_code
+
+
+class WSGIDriver:
+
+    def __init__(self):
+        from django.core.wsgi import get_wsgi_application
+        from django.middleware.csrf import _get_new_csrf_token
+        self.application = get_wsgi_application()
+        self.csrf_token = _get_new_csrf_token()
+
+    def request(self, method, path, data):
+        body = b''
+        if method == 'POST':
+            body = urlencode(
+                dict(data, csrfmiddlewaretoken=self.csrf_token)).encode()
+        environ = {
+            'REQUEST_METHOD': method,
+            'PATH_INFO': path,
+            'QUERY_STRING': '',
+            'SERVER_NAME': 'testserver',
+            'SERVER_PORT': '80',
+            'SERVER_PROTOCOL': 'HTTP/1.1',
+            'HTTP_HOST': 'testserver',
+            'HTTP_COOKIE': f'csrftoken={self.csrf_token}',
+            'CONTENT_TYPE': 'application/x-www-form-urlencoded',
+            'CONTENT_LENGTH': str(len(body)),
+            'wsgi.input': BytesIO(body),
+            'wsgi.url_scheme': 'http',
+            'wsgi.errors': BytesIO(),
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': True,
+            'wsgi.run_once': False,
+            'wsgi.version': (1, 0),
+        }
+        status = []
+        response = self.application(
+            environ, lambda code, headers, exc_info=None: status.append(code))
+        for _ in response:
+            pass
+        response.close()
+        return int(status[0].split()[0])
+
+
+DRIVERS = {'client': ClientDriver, 'wsgi': WSGIDriver}
+
+
+def create_list(size):
+    from lists.models import Item, List
+    list_ = List.objects.create()
+    batch = 5000
+    for start in range(0, size, batch):
+        Item.objects.bulk_create(
+            Item(list=list_, text=f'item {n}')
+            for n in range(start, min(start + batch, size))
+        )
+    List.objects.filter(id=list_.id).rebuild_stats()
+    return list_
+
+
+def build_scenarios(sizes):
+    counter = itertools.count()
+    scenarios = [
+        Scenario('home_page', 0, 'GET', '/', None),
+        Scenario('new_list', 0, 'POST', '/lists/new',
+                 lambda: {'text': f'new item {next(counter)}'}),
+    ]
+    for size in sizes:
+        list_ = create_list(size)
+        scenarios.append(
+            Scenario('view_list', size, 'GET', f'/lists/{list_.id}/', None))
+    return scenarios
+
+
+def run_scenario(scenario, driver_class, requests, concurrency, cold):
+    from django.core.cache import caches
+    from django.db import connection, connections
+    from django.test.utils import CaptureQueriesContext
+
+    local = threading.local()
+
+    def one_request(_):
+        if not hasattr(local, 'driver'):
+            local.driver = driver_class()
+        if cold:
+            caches['lists'].clear()
+        data = scenario.data() if scenario.data else None
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            status = local.driver.request(scenario.method, scenario.path, data)
+            elapsed = time.perf_counter() - start
+        return elapsed, len(queries), status
+
+    with ThreadPoolExecutor(max_workers=concurrency,
+                            initializer=connections.close_all) as pool:
+        timings = list(pool.map(one_request, range(requests)))
+    connections.close_all()
+
+    # allocations are measured single-threaded, outside the timed runs,
+    # because tracemalloc both slows requests down and is process-wide
+    driver = driver_class()
+    peaks = []
+    tracemalloc.start()
+    for _ in range(min(requests, 20)):
+        if cold:
+            caches['lists'].clear()
+        data = scenario.data() if scenario.data else None
+        tracemalloc.clear_traces()
+        driver.request(scenario.method, scenario.path, data)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+    tracemalloc.stop()
+
+    latencies = sorted(elapsed * 1000 for elapsed, _, _ in timings)
+    # the median skips the PRAGMAs run on each thread's first connection
+    queries = sorted(count for _, count, _ in timings)
+    return {
+        'scenario': scenario.name,
+        'size': scenario.size,
+        'requests': requests,
+        'errors': sum(1 for _, _, status in timings if status >= 400),
+        'mean_ms': sum(latencies) / len(latencies),
+        'p50_ms': percentile(latencies, 0.50),
+        'p95_ms': percentile(latencies, 0.95),
+        'p99_ms': percentile(latencies, 0.99),
+        'queries': queries[len(queries) // 2],
+        'alloc_peak_kb': sorted(peaks)[len(peaks) // 2] / 1024,
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='10,1000,10000',
+                        help='comma-separated item counts for view_list')
+    parser.add_argument('--requests', type=int, default=200,
+                        help='requests per scenario')
+    parser.add_argument('--concurrency', type=int, default=1)
+    parser.add_argument('--handler', choices=sorted(DRIVERS), default='client')
+    parser.add_argument('--cold', action='store_true',
+                        help='clear the list page cache before every request')
+    parser.add_argument('--output', help='write results as JSON to this file')
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(',')]
+
+    tmp = tempfile.TemporaryDirectory()
+    os.environ['DJANGO_DB_PATH'] = os.path.join(tmp.name, 'bench.sqlite3')
+    setup_django()
+    from django.conf import settings
+    from django.core.management import call_command
+    call_command('migrate', verbosity=0)
+
+    scenarios = build_scenarios(sizes)
+    results = []
+    print(f"{'scenario':<10} {'size':>7} {'p50 ms':>8} {'p95 ms':>8} "
+          f"{'p99 ms':>8} {'queries':>7} {'alloc KB':>9} {'errors':>6}")
+    for scenario in scenarios:
+        result = run_scenario(
+            scenario, DRIVERS[args.handler], args.requests, args.concurrency,
+            args.cold)
+        results.append(result)
+        print(f"{result['scenario']:<10} {result['size']:>7} "
+              f"{result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f} "
+              f"{result['p99_ms']:>8.2f} {result['queries']:>7} "
+              f"{result['alloc_peak_kb']:>9.1f} {result['errors']:>6}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                'revision': git_revision(),
+                'python': platform.python_version(),
+                'handler': args.handler,
+                'concurrency': args.concurrency,
+                'cold': args.cold,
+                'lean': settings.LEAN,
+                'results': results,
+            }, f, indent=2)
+    tmp.cleanup()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""Item search latency: the full-text index (lists.search) against the
+LIKE '%word%' scan it replaces, over --items items in a throwaway SQLite
+database.
+
+    python -m benchmarks.search --items 1000000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from benchmarks import setup_django
+
+VOCABULARY = [f'word{n}' for n in range(5000)]
+QUERIES = ['word17', 'word4242 word99', 'word123 word7 word3', 'nosuchword']
+
+
+def populate(count, per_list=1000):
+    from django.db import connection, transaction
+    from lists.models import List, text_digest
+
+    rng = random.Random(0)
+    with transaction.atomic(), connection.cursor() as cursor:
+        for start in range(0, count, per_list):
+            list_id = List.objects.create().id
+            texts = [f'{n} ' + ' '.join(rng.sample(VOCABULARY, 4))
+                     for n in range(start, min(start + per_list, count))]
+            cursor.executemany(
+                "INSERT INTO lists_item (list_id, text, text_digest, modified) "
+                "VALUES (%s, %s, %s, datetime('now'))",
+                [(list_id, text, text_digest(text)) for text in texts])
+
+
+def median_ms(repeat, run):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    return sorted(timings)[len(timings) // 2] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--items', type=int, default=1000000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    tmp = tempfile.TemporaryDirectory()
+    os.environ['DJANGO_DB_PATH'] = os.path.join(tmp.name, 'bench.sqlite3')
+    setup_django()
+    from django.core.management import call_command
+    from lists import search
+    from lists.models import Item
+
+    call_command('migrate', verbosity=0)
+    populate(args.items)
+    print(f'{args.items} items, index: {type(search.get_index()).__name__}')
+    for query in QUERIES:
+        def scan():
+            items = Item.objects.all()
+            for word in query.split():
+                items = items.filter(text__contains=word)
+            return list(items.values_list('id', 'list_id', 'text')[:50])
+
+        indexed = median_ms(args.repeat, lambda: search.search(query))
+        scanned = median_ms(args.repeat, scan)
+        print(f'{query!r:>20}: index {indexed:8.2f} ms, LIKE scan {scanned:8.2f} ms')
+    tmp.cleanup()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""Item table rendering: the template the list page used to include, run
+through the template engine, versus the lists.tables fast path, for one
+page of --rows items.
+
+    python -m benchmarks.table_render --rows 10000
+"""
+import argparse
+import time
+
+from benchmarks import setup_django
+
+# the markup render_table reproduces, as the list page's template had it
+TABLE_TEMPLATE = """<table id="id_list_table" class="table">
+    {% for item in items %}
+      <tr><td>{{ forloop.counter|add:start }}: {{ item.text }}</td></tr>
+    {% endfor %}
+  </table>
+  {% if next_page %}
+    <a id="id_load_more" href="?{{ next_page }}"
+       data-url="{% url 'list_items' list.id %}?{{ next_page }}">Load more</a>
+  {% endif %}
+"""
+
+
+def best_of(repeat, render):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        render()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.template import engines
+    from lists.models import Item, List
+    from lists.tables import render_table
+
+    list_ = List(id=1)
+    rows = [(n, f'item <{n}> & more') for n in range(1, args.rows + 1)]
+    items = [Item(id=id_, text=text) for id_, text in rows]
+    template = engines['django'].from_string(TABLE_TEMPLATE)
+    context = {'list': list_, 'items': items, 'start': 0, 'next_page': 'after=1'}
+
+    assert template.render(context) == render_table(list_.id, rows, 0, 'after=1')
+    engine = best_of(args.repeat, lambda: template.render(context))
+    fast = best_of(args.repeat, lambda: render_table(list_.id, rows, 0, 'after=1'))
+    print(f'{"template":>10}: {engine * 1000:8.2f} ms')
+    print(f'{"fast path":>10}: {fast * 1000:8.2f} ms ({engine / fast:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+import json
+
+from django.http import HttpResponse, HttpResponseBadRequest, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_http_methods
+
+from lists import search
+from lists.bulk import create_list_with_items, import_items
+from lists.forms import ExistingListItemForm, ItemForm
+from lists.models import Item, List
+from lists.views import get_cursor, item_page
+
+
+def api_response(data, status=200):
+    return JsonResponse(
+        data, status=status, json_dumps_params={'separators': (',', ':')})
+
+
+def form_errors(form):
+    return api_response(
+        {'errors': {field: list(errors) for field, errors in form.errors.items()}},
+        status=400,
+    )
+
+
+def read_json(request):
+    try:
+        data = json.loads(request.body.decode(request.encoding or 'utf-8'))
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def item_data(item):
+    return {'id': item.id, 'text': item.text}
+
+
+def list_items(request, list_id):
+    list_ = get_object_or_404(List, id=list_id)
+    try:
+        after, start = get_cursor(request.GET)
+    except ValueError:
+        return HttpResponseBadRequest('Invalid page cursor')
+    rows, next_page = item_page(list_.id, after, start)
+    return api_response({
+        'items': [
+            {'id': id_, 'number': number, 'text': text}
+            for number, (id_, text) in enumerate(rows, start=start + 1)
+        ],
+        'next': next_page and f"{request.path}?{next_page}",
+        'count': list_.item_count,
+    })
+
+
+@csrf_exempt
+@require_http_methods(['POST'])
+def create_list(request):
+    data = read_json(request)
+    if data is None:
+        return api_response({'errors': {'__all__': ['Expected a JSON object']}}, 400)
+    if 'items' in data:
+        texts = data['items']
+        if not texts or not isinstance(texts, list) or not all(
+                isinstance(text, str) for text in texts):
+            return api_response(
+                {'errors': {'items': ['Expected a list of item texts']}}, 400)
+        list_, errors = create_list_with_items(texts)
+        if list_ is None:
+            return api_response({'errors': {'items': errors}}, 400)
+        return api_response({'id': list_.id, 'items': [
+            {'id': id_, 'text': text}
+            for id_, text in list_.item_set.values_list('id', 'text')
+        ]}, status=201)
+    form = ItemForm(data=data)
+    if not form.is_valid():
+        return form_errors(form)
+    list_ = List.objects.create()
+    item = form.save(for_list=list_)
+    return api_response({'id': list_.id, 'items': [item_data(item)]}, status=201)
+
+
+@csrf_exempt
+@require_http_methods(['GET', 'POST'])
+def items(request, list_id):
+    if request.method == 'GET':
+        return list_items(request, list_id)
+    list_ = get_object_or_404(List, id=list_id)
+    data = read_json(request)
+    if data is None:
+        return api_response({'errors': {'__all__': ['Expected a JSON object']}}, 400)
+    if 'items' in data:
+        texts = data['items']
+        if not texts or not isinstance(texts, list) or not all(
+                isinstance(text, str) for text in texts):
+            return api_response(
+                {'errors': {'items': ['Expected a list of item texts']}}, 400)
+        created, errors = import_items(list_, texts)
+        return api_response({'created': created, 'errors': errors},
+                            status=201 if created else 400)
+    form = ExistingListItemForm(for_list=list_, data=data, defer_unique=True)
+    item = form.save() if form.is_valid() else None
+    if item is None:
+        return form_errors(form)
+    return api_response(item_data(item), status=201)
+
+
+@csrf_exempt
+@require_http_methods(['DELETE'])
+def item(request, list_id, item_id):
+    get_object_or_404(Item, id=item_id, list_id=list_id).delete()
+    return HttpResponse(status=204)
+
+
+@require_http_methods(['GET'])
+def search_items(request, list_id=None):
+    if list_id is not None:
+        list_id = get_object_or_404(List, id=list_id).id
+    query = request.GET.get('q', '')
+    return api_response({
+        'query': query,
+        'items': [
+            {'id': id_, 'list': list_id_, 'text': text}
+            for id_, list_id_, text in search.search(query, list_id)
+        ],
+    })
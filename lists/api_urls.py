@@ -0,0 +1,11 @@
+from django.conf.urls import url
+from lists import api
+
+
+urlpatterns = [
+    url(r'^$', api.create_list, name='api_create_list'),
+    url(r'^search$', api.search_items, name='api_search'),
+    url(r'^(\d+)/search$', api.search_items, name='api_search_list'),
+    url(r'^(\d+)/items$', api.items, name='api_items'),
+    url(r'^(\d+)/items/(\d+)$', api.item, name='api_item'),
+]
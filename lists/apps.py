@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class ListsConfig(AppConfig):
     name = 'lists'
+
+    def ready(self):
+        from lists import signals  # noqa: F401
@@ -0,0 +1,122 @@
+from itertools import islice
+from operator import itemgetter
+
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+
+from lists.forms import DUPLICATE_ITEM_ERROR, ItemForm, find_duplicates
+from lists import search
+from lists.models import Item, List, text_digest
+from lists.signals import contents_changed
+
+# Lines handled per round: keeps the text_digest__in lookup under SQLite's
+# 999 bound-parameter limit. The inserts are left to bulk_create, which
+# splits them to fit the database's own limits.
+BATCH_SIZE = 900
+
+
+def clean_lines(numbered_lines, seen, errors):
+    """Apply ItemForm's rules to (line number, line) pairs, returning the
+    (line number, text) pairs that pass. Rejected lines are appended to
+    errors; seen holds the digests of texts accepted so far."""
+    text_field = ItemForm.base_fields['text']
+    candidates = []
+    for line_number, line in numbered_lines:
+        try:
+            text = text_field.clean(line)
+        except ValidationError as e:
+            errors.append({'line': line_number, 'text': line.rstrip('\r\n'),
+                           'error': e.messages[0]})
+            continue
+        digest = text_digest(text)
+        if digest in seen:
+            errors.append(
+                {'line': line_number, 'text': text, 'error': DUPLICATE_ITEM_ERROR})
+            continue
+        seen.add(digest)
+        candidates.append((line_number, text))
+    return candidates
+
+
+def insert_one_by_one(numbered_items, errors):
+    """Insert (line number, item) pairs each under its own savepoint, so the
+    unique constraint can reject the duplicates one at a time. Returns the
+    number inserted; integrity errors other than duplicates are re-raised."""
+    inserted = 0
+    for line_number, item in numbered_items:
+        try:
+            with transaction.atomic():
+                item.save()
+        except IntegrityError:
+            if not find_duplicates(item.list, [item.text]):
+                raise
+            errors.append(
+                {'line': line_number, 'text': item.text, 'error': DUPLICATE_ITEM_ERROR})
+        else:
+            inserted += 1
+    return inserted
+
+
+def import_items(list_, lines, batch_size=BATCH_SIZE):
+    """Add one item per line to list_, applying ItemForm's rules.
+
+    Lines are consumed batch_size at a time: each batch is checked for
+    duplicates and bulk inserted (in several INSERTs on SQLite) in one
+    transaction. Should a concurrent writer add one of the texts first, the
+    batch falls back to inserting row by row. Returns the number of items
+    created and a list of {'line', 'text', 'error'} dicts for the lines that
+    were rejected.
+    """
+    created = 0
+    errors = []
+    seen = set()
+    lines = enumerate(lines, start=1)
+    while True:
+        batch = list(islice(lines, batch_size))
+        if not batch:
+            break
+        candidates = clean_lines(batch, seen, errors)
+        if not candidates:
+            continue
+
+        with transaction.atomic():
+            duplicates = find_duplicates(list_, [text for _, text in candidates])
+            new_items = []
+            for line_number, text in candidates:
+                if text in duplicates:
+                    errors.append({'line': line_number, 'text': text,
+                                   'error': DUPLICATE_ITEM_ERROR})
+                else:
+                    new_items.append((line_number, Item(list=list_, text=text)))
+            if not new_items:
+                continue
+            try:
+                with transaction.atomic():
+                    Item.objects.bulk_create(item for _, item in new_items)
+            except IntegrityError:
+                # each save() keeps the list's stats up to date itself
+                created += insert_one_by_one(new_items, errors)
+            else:
+                contents_changed(list_.id, added=len(new_items))
+                created += len(new_items)
+        search.items_changed()
+    errors.sort(key=itemgetter('line'))
+    return created, errors
+
+
+def create_list_with_items(texts):
+    """Create a list holding one item per text, in one transaction with a
+    bulk insert, or nothing at all if any text breaks ItemForm's
+    rules. Returns the new list (or None) and the errors as import_items
+    reports them."""
+    errors = []
+    candidates = clean_lines(enumerate(texts, start=1), set(), errors)
+    if errors:
+        return None, errors
+    with transaction.atomic():
+        list_ = List.objects.create()
+        Item.objects.bulk_create(
+            [Item(list=list_, text=text) for _, text in candidates])
+        contents_changed(list_.id, added=len(candidates))
+    search.items_changed()
+    return list_, []
@@ -0,0 +1,141 @@
+import pickle
+import threading
+import time
+import uuid
+from collections import OrderedDict, namedtuple
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.utils.safestring import mark_safe
+
+CACHE_ALIAS = 'lists'
+
+# etag and last_modified are the list's HTTP validators at render time, so
+# conditional GETs can be answered from the cache as well.
+ListTable = namedtuple('ListTable', 'html etag last_modified')
+
+# Django creates a backend instance per thread, so, as with LocMemCache, the
+# stores live here, keyed by LOCATION, and every thread sees the same one.
+_caches = {}
+_locks = {}
+
+
+class LRUCache(BaseCache):
+    """Thread-safe local-memory cache that evicts the least recently used
+    key once MAX_ENTRIES is reached. It is per process: other processes'
+    writes only show once the entries they made stale time out."""
+
+    def __init__(self, name, params):
+        super().__init__(params)
+        self._cache = _caches.setdefault(name, OrderedDict())
+        self._lock = _locks.setdefault(name, threading.Lock())
+
+    def _get_fresh(self, key):
+        try:
+            expiry, pickled = self._cache[key]
+        except KeyError:
+            return None
+        if expiry is not None and expiry <= time.time():
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return pickled
+
+    def _set(self, key, value, timeout):
+        self._cache[key] = (self.get_backend_timeout(timeout), value)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self._max_entries:
+            self._cache.popitem(last=False)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_key(key, version=version)
+        self.validate_key(key)
+        pickled = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            if self._get_fresh(key) is not None:
+                return False
+            self._set(key, pickled, timeout)
+            return True
+
+    def get(self, key, default=None, version=None):
+        key = self.make_key(key, version=version)
+        self.validate_key(key)
+        with self._lock:
+            pickled = self._get_fresh(key)
+        if pickled is None:
+            return default
+        return pickle.loads(pickled)
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_key(key, version=version)
+        self.validate_key(key)
+        pickled = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._set(key, pickled, timeout)
+
+    def incr(self, key, delta=1, version=None):
+        key = self.make_key(key, version=version)
+        self.validate_key(key)
+        with self._lock:
+            pickled = self._get_fresh(key)
+            if pickled is None:
+                raise ValueError("Key '%s' not found" % key)
+            new_value = pickle.loads(pickled) + delta
+            expiry, _ = self._cache[key]
+            self._cache[key] = (
+                expiry, pickle.dumps(new_value, pickle.HIGHEST_PROTOCOL))
+        return new_value
+
+    def has_key(self, key, version=None):
+        key = self.make_key(key, version=version)
+        self.validate_key(key)
+        with self._lock:
+            return self._get_fresh(key) is not None
+
+    def delete(self, key, version=None):
+        key = self.make_key(key, version=version)
+        self.validate_key(key)
+        with self._lock:
+            self._cache.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+
+def _version_key(list_id):
+    return f'list:{list_id}:version'
+
+
+def _table_key(list_id, version, page):
+    return f'list:{list_id}:table:{version}:{page}'
+
+
+def get_version(list_id):
+    cache = caches[CACHE_ALIAS]
+    version = cache.get(_version_key(list_id))
+    if version is None:
+        version = uuid.uuid4().hex
+        if not cache.add(_version_key(list_id), version):
+            version = cache.get(_version_key(list_id), version)
+    return version
+
+
+def bump_version(list_id):
+    caches[CACHE_ALIAS].set(_version_key(list_id), uuid.uuid4().hex)
+
+
+def get_table(list_id, page=''):
+    """Return (table, version) for one page of the list's item table; table
+    is None on a miss and should be stored with set_table under the returned
+    version."""
+    version = get_version(list_id)
+    table = caches[CACHE_ALIAS].get(_table_key(list_id, version, page))
+    if table is not None:
+        table = table._replace(html=mark_safe(table.html))
+    return table, version
+
+
+def set_table(list_id, version, table, page=''):
+    table = table._replace(html=str(table.html))
+    caches[CACHE_ALIAS].set(_table_key(list_id, version, page), table)
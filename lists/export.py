@@ -0,0 +1,31 @@
+import json
+
+from lists.models import Item
+
+CHUNK_SIZE = 1000
+
+
+def iter_items(list_id=None, since_id=0, chunk_size=CHUNK_SIZE):
+    """Yield (id, list_id, text) for items with id > since_id, in id order.
+
+    Rows are fetched chunk_size at a time by seeking past the last id seen,
+    so memory use does not depend on how many items there are.
+    """
+    items = Item.objects.all()
+    if list_id is not None:
+        items = items.filter(list_id=list_id)
+    last_id = since_id
+    while True:
+        chunk = list(
+            items.filter(id__gt=last_id)
+            .values_list('id', 'list_id', 'text')[:chunk_size]
+        )
+        yield from chunk
+        if len(chunk) < chunk_size:
+            return
+        last_id = chunk[-1][0]
+
+
+def ndjson_lines(list_id=None, since_id=0, chunk_size=CHUNK_SIZE):
+    for id_, list_id_, text in iter_items(list_id, since_id, chunk_size):
+        yield json.dumps({'id': id_, 'list': list_id_, 'text': text}) + '\n'
@@ -1,5 +1,6 @@
 from django import forms
-from lists.models import Item
+from django.db import IntegrityError, transaction
+from lists.models import Item, text_digest
 from django.core.exceptions import ValidationError
 
 EMPTY_ITEM_ERROR = "You can't have an empty list item"
@@ -22,14 +23,33 @@ class ItemForm(forms.models.ModelForm):
 
     def save(self, for_list):
         self.instance.list = for_list
-        return super().save()
+        with transaction.atomic():
+            return super().save()
+
+def find_duplicates(for_list, texts):
+    """Return the subset of texts already in for_list, in one query."""
+    digests = {text: text_digest(text) for text in texts}
+    existing = set(
+        Item.objects.filter(list=for_list, text_digest__in=set(digests.values()))
+        .order_by().values_list('text_digest', flat=True)
+    )
+    return {text for text, digest in digests.items() if digest in existing}
+
 
 class ExistingListItemForm(ItemForm):
-    def __init__(self, for_list, *args, **kwargs):
+    """With defer_unique=True duplicates are not looked up during validation;
+    the unique constraint on (list, text_digest) rejects them on insert
+    instead, and save() then returns None with DUPLICATE_ITEM_ERROR on the form.
+    Integrity errors not caused by a duplicate are re-raised."""
+
+    def __init__(self, for_list, *args, defer_unique=False, **kwargs):
         super().__init__(*args, **kwargs)
         self.instance.list = for_list
+        self.defer_unique = defer_unique
 
     def validate_unique(self):
+        if self.defer_unique:
+            return
         try:
             self.instance.validate_unique()
         except ValidationError as e:
@@ -37,4 +57,13 @@ class ExistingListItemForm(ItemForm):
             self._update_errors(e)
 
     def save(self):
-        return forms.models.ModelForm.save(self)
\ No newline at end of file
+        try:
+            with transaction.atomic():
+                return forms.models.ModelForm.save(self)
+        except IntegrityError:
+            # only a duplicate is the user's to fix; other failures propagate
+            if not self.defer_unique or not find_duplicates(
+                    self.instance.list, [self.instance.text]):
+                raise
+            self.add_error('text', DUPLICATE_ITEM_ERROR)
+            return None
\ No newline at end of file
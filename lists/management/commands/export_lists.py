@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from lists.export import CHUNK_SIZE, ndjson_lines
+
+
+class Command(BaseCommand):
+    help = ('Writes items as NDJSON, one {"id", "list", "text"} object per '
+            'line in id order. Use --since-id for incremental dumps.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--list', dest='list_id', type=int,
+                            help='only export this list')
+        parser.add_argument('--since-id', type=int, default=0,
+                            help='only export items with a greater id')
+        parser.add_argument('--output', default='-',
+                            help='file to write, or - for stdout')
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+
+    def handle(self, list_id, since_id, output, chunk_size, **options):
+        lines = ndjson_lines(list_id, since_id, chunk_size)
+        if output == '-':
+            for line in lines:
+                self.stdout.write(line, ending='')
+        else:
+            with open(output, 'w', encoding='utf-8') as f:
+                f.writelines(lines)
@@ -0,0 +1,31 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from lists.bulk import BATCH_SIZE, import_items
+from lists.models import List
+
+
+class Command(BaseCommand):
+    help = 'Adds one item per line of a text file to an existing list.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('list_id', type=int)
+        parser.add_argument('path', help="file to read, or - for stdin")
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+
+    def handle(self, list_id, path, batch_size, **options):
+        try:
+            list_ = List.objects.get(id=list_id)
+        except List.DoesNotExist:
+            raise CommandError(f'List {list_id} does not exist')
+
+        if path == '-':
+            created, errors = import_items(list_, sys.stdin, batch_size)
+        else:
+            with open(path, encoding='utf-8') as f:
+                created, errors = import_items(list_, f, batch_size)
+
+        for error in errors:
+            self.stderr.write(f"line {error['line']}: {error['error']}")
+        self.stdout.write(f'Imported {created} items, {len(errors)} rejected')
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from lists.models import List
+
+BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = "Recomputes each list's item_count and last_item_id from its items."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+
+    def handle(self, batch_size, **options):
+        updated = 0
+        last_id = 0
+        while True:
+            ids = list(
+                List.objects.filter(id__gt=last_id).order_by('id')
+                .values_list('id', flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            updated += List.objects.filter(id__in=ids).rebuild_stats()
+            last_id = ids[-1]
+        self.stdout.write(f'Rebuilt stats for {updated} lists')
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from lists.export import CHUNK_SIZE
+from lists.search import get_index
+
+
+class Command(BaseCommand):
+    help = ('Rebuilds the full-text index over item text from scratch, '
+            'reading items CHUNK_SIZE at a time.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+
+    def handle(self, chunk_size, **options):
+        index = get_index()
+        indexed = index.rebuild(chunk_size)
+        self.stdout.write(f'Indexed {indexed} items with {type(index).__name__}')
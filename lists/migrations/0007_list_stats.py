@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+def populate_stats(apps, schema_editor):
+    List = apps.get_model('lists', 'List')
+    Item = apps.get_model('lists', 'Item')
+    for list_id, count, last_item_id in (
+            Item.objects.order_by().values('list')
+            .annotate(count=models.Count('id'), last=models.Max('id'))
+            .values_list('list', 'count', 'last')):
+        List.objects.filter(id=list_id).update(
+            item_count=count, last_item_id=last_item_id)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lists', '0006_modification_tracking'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='list',
+            name='item_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='list',
+            name='last_item_id',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.RunPython(populate_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+from lists.migrations import _search
+
+
+def create_search_index(apps, schema_editor):
+    _search.install(schema_editor)
+    _search.rebuild(schema_editor)
+
+
+def drop_search_index(apps, schema_editor):
+    _search.uninstall(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lists', '0007_list_stats'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
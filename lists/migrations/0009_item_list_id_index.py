@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+from lists.migrations import _search
+
+
+def reinstall_search_index(apps, schema_editor):
+    # altering the column rebuilds lists_item on SQLite, dropping its triggers;
+    # this runs last either way: after the forward operations, and (from the
+    # first operation) after the reverse ones
+    _search.install(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lists', '0008_item_search'),
+    ]
+
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop, reinstall_search_index),
+        migrations.AlterField(
+            model_name='item',
+            name='list',
+            field=models.ForeignKey(db_index=False, default=None, on_delete=django.db.models.deletion.CASCADE, to='lists.List'),
+        ),
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(fields=['list', 'id'], name='lists_item_list_id_id'),
+        ),
+        migrations.RunPython(reinstall_search_index, migrations.RunPython.noop),
+    ]
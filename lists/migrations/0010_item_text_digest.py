@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import lists.models
+
+from lists.migrations import _search
+
+# each UPDATE binds two parameters per row plus the id range, staying under
+# the 999-variable limit of SQLite builds older than 3.32
+BATCH_SIZE = 300
+
+
+def backfill_digests(apps, schema_editor):
+    Item = apps.get_model('lists', 'Item')
+    last_id = 0
+    while True:
+        batch = list(
+            Item.objects.filter(id__gt=last_id).order_by('id')
+            .values_list('id', 'text')[:BATCH_SIZE]
+        )
+        if not batch:
+            break
+        Item.objects.filter(id__gt=last_id, id__lte=batch[-1][0]).update(
+            text_digest=models.Case(*[
+                models.When(id=id_, then=models.Value(lists.models.text_digest(text)))
+                for id_, text in batch
+            ], output_field=models.CharField()),
+        )
+        last_id = batch[-1][0]
+
+
+def reinstall_search_index(apps, schema_editor):
+    # adding or removing the column rebuilds lists_item on SQLite, dropping
+    # its triggers; this runs last either way, as in 0009
+    _search.install(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lists', '0009_item_list_id_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop, reinstall_search_index),
+        migrations.AddField(
+            model_name='item',
+            name='text_digest',
+            field=lists.models.TextDigestField('text', default=''),
+        ),
+        migrations.RunPython(backfill_digests, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name='item',
+            unique_together=set([('list', 'text_digest')]),
+        ),
+        migrations.RunPython(reinstall_search_index, migrations.RunPython.noop),
+    ]
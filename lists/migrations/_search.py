@@ -0,0 +1,81 @@
+"""The search index schema as migrations 0008 to 0010 create it.
+
+A frozen copy of what lists.search installed at the time, so later changes
+to that module do not alter how these migrations run. The leading
+underscore keeps the migration loader from treating this as a migration.
+"""
+import sqlite3
+
+FTS5_SCHEMA = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS lists_item_fts USING fts5("
+    "text, content='lists_item', content_rowid='id')",
+    "CREATE TRIGGER IF NOT EXISTS lists_item_fts_insert AFTER INSERT ON lists_item "
+    "BEGIN INSERT INTO lists_item_fts(rowid, text) VALUES (new.id, new.text); END",
+    "CREATE TRIGGER IF NOT EXISTS lists_item_fts_delete AFTER DELETE ON lists_item "
+    "BEGIN INSERT INTO lists_item_fts(lists_item_fts, rowid, text) "
+    "VALUES ('delete', old.id, old.text); END",
+    "CREATE TRIGGER IF NOT EXISTS lists_item_fts_update AFTER UPDATE OF text "
+    "ON lists_item BEGIN "
+    "INSERT INTO lists_item_fts(lists_item_fts, rowid, text) "
+    "VALUES ('delete', old.id, old.text); "
+    "INSERT INTO lists_item_fts(rowid, text) VALUES (new.id, new.text); END",
+)
+
+FTS5_REBUILD = "INSERT INTO lists_item_fts(lists_item_fts) VALUES ('rebuild')"
+
+FTS5_DROP = (
+    'DROP TRIGGER IF EXISTS lists_item_fts_update',
+    'DROP TRIGGER IF EXISTS lists_item_fts_delete',
+    'DROP TRIGGER IF EXISTS lists_item_fts_insert',
+    'DROP TABLE IF EXISTS lists_item_fts',
+)
+
+TRIGRAM_SCHEMA = (
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    'CREATE INDEX IF NOT EXISTS lists_item_text_trgm '
+    'ON lists_item USING gin (text gin_trgm_ops)',
+)
+
+TRIGRAM_DROP = ('DROP INDEX IF EXISTS lists_item_text_trgm',)
+
+
+def has_fts5(connection):
+    if connection.vendor != 'sqlite':
+        return False
+    try:
+        sqlite3.connect(':memory:').execute(
+            'CREATE VIRTUAL TABLE probe USING fts5(text)')
+    except sqlite3.OperationalError:
+        return False
+    return True
+
+
+def install(schema_editor):
+    """Create the database's search index if missing. Migrations that
+    rebuild lists_item on SQLite, which drops its triggers, call this again."""
+    connection = schema_editor.connection
+    if has_fts5(connection):
+        create = FTS5_SCHEMA
+    elif connection.vendor == 'postgresql':
+        create = TRIGRAM_SCHEMA
+    else:
+        create = ()
+    for sql in create:
+        schema_editor.execute(sql)
+
+
+def rebuild(schema_editor):
+    if has_fts5(schema_editor.connection):
+        schema_editor.execute(FTS5_REBUILD)
+
+
+def uninstall(schema_editor):
+    connection = schema_editor.connection
+    if has_fts5(connection):
+        drop = FTS5_DROP
+    elif connection.vendor == 'postgresql':
+        drop = TRIGRAM_DROP
+    else:
+        drop = ()
+    for sql in drop:
+        schema_editor.execute(sql)
@@ -1,20 +1,97 @@
+import hashlib
+import unicodedata
+
 from django.db import models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.core.urlresolvers import reverse
 
 
+def item_count_subquery():
+    return Coalesce(Subquery(
+        Item.objects.filter(list=OuterRef('pk')).order_by()
+        .values('list').annotate(count=Count('id')).values('count'),
+        output_field=models.PositiveIntegerField(),
+    ), 0)
+
+
+def last_item_id_subquery():
+    return Subquery(
+        Item.objects.filter(list=OuterRef('pk')).order_by('-id').values('id')[:1],
+        output_field=models.IntegerField(),
+    )
+
+
+class ListQuerySet(models.QuerySet):
+
+    def rebuild_stats(self):
+        """Recompute item_count and last_item_id from Item."""
+        return self.update(
+            item_count=item_count_subquery(),
+            last_item_id=last_item_id_subquery(),
+        )
+
+
 class List(models.Model):
+    version = models.PositiveIntegerField(default=0)
+    modified = models.DateTimeField(auto_now=True)
+    item_count = models.PositiveIntegerField(default=0)
+    last_item_id = models.IntegerField(null=True, blank=True)
+
+    objects = ListQuerySet.as_manager()
 
     def get_absolute_url(self):
         return reverse('view_list', args=[self.id])
 
+    @property
+    def etag(self):
+        return f'"{self.id}-{self.version}"'
+
+
+def text_digest(text):
+    """SHA-256 of the NFC-normalized text, so texts that only differ in how
+    their accents are encoded count as the same item."""
+    return hashlib.sha256(
+        unicodedata.normalize('NFC', text).encode('utf-8')).hexdigest()
+
+
+class TextDigestField(models.CharField):
+    """Holds text_digest() of another field, recomputed on every save,
+    bulk_create included. QuerySet.update() bypasses it."""
+
+    def __init__(self, source, *args, **kwargs):
+        self.source = source
+        kwargs['max_length'] = 64
+        kwargs['editable'] = False
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        del kwargs['max_length'], kwargs['editable']
+        return name, path, [self.source] + list(args), kwargs
+
+    def pre_save(self, model_instance, add):
+        value = text_digest(getattr(model_instance, self.source))
+        setattr(model_instance, self.attname, value)
+        return value
+
 
 class Item(models.Model):
     text = models.TextField(default='')
-    list = models.ForeignKey(List, default=None)
+    # uniqueness is enforced on this fixed-size digest, not the unbounded text
+    text_digest = TextDigestField('text', default='')
+    # indexed by the (list, id) index below, which serves list lookups too
+    list = models.ForeignKey(List, default=None, db_index=False)
+    modified = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ('id',)
-        unique_together = ('list', 'text',)
+        unique_together = ('list', 'text_digest',)
+        indexes = [models.Index(fields=['list', 'id'], name='lists_item_list_id_id')]
 
     def __str__(self):
-        return self.text
\ No newline at end of file
+        return self.text
+
+    def validate_unique(self, exclude=None):
+        self.text_digest = text_digest(self.text)
+        super().validate_unique(exclude)
@@ -0,0 +1,204 @@
+"""Full-text search over Item.text.
+
+Which index answers a search depends on the database:
+
+* SQLite built with FTS5: the lists_item_fts external-content table, kept
+  in step with lists_item by triggers, so bulk writes are indexed too.
+* PostgreSQL: a pg_trgm GIN index on text, used by ILIKE. Creating the
+  extension needs a role allowed to run CREATE EXTENSION.
+* anything else: an in-process inverted index, built on first use and
+  updated from the Item signals (lists/signals.py). It only sees the
+  writes made by its own process.
+
+The first two are created by migrations 0008 to 0010, from the frozen
+schema in lists/migrations/_search.py.
+
+A search matches the items containing every word of the query (on
+PostgreSQL, anywhere in the text, not just as whole words) and returns
+(id, list_id, text) rows in item id order.
+"""
+import heapq
+import re
+import sqlite3
+import threading
+from functools import lru_cache
+from itertools import islice
+
+from django.db import connections, transaction
+
+from lists.export import CHUNK_SIZE, iter_items
+from lists.models import Item
+
+SEARCH_LIMIT = 50
+
+WORD_RE = re.compile(r'\w+')
+
+
+def words(text):
+    return WORD_RE.findall(text.casefold())
+
+
+@lru_cache(maxsize=None)
+def sqlite_has_fts5():
+    try:
+        sqlite3.connect(':memory:').execute(
+            'CREATE VIRTUAL TABLE probe USING fts5(text)')
+    except sqlite3.OperationalError:
+        return False
+    return True
+
+
+def _fetch(using, sql, params):
+    with connections[using].cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+
+class Fts5Index:
+
+    def __init__(self, using='default'):
+        self.using = using
+
+    def search(self, query_words, list_id, limit):
+        match = ' '.join(f'"{word}"' for word in query_words)
+        sql = ('SELECT i.id, i.list_id, i.text FROM lists_item_fts '
+               'JOIN lists_item i ON i.id = lists_item_fts.rowid '
+               'WHERE lists_item_fts MATCH %s')
+        params = [match]
+        if list_id is not None:
+            sql += ' AND i.list_id = %s'
+            params.append(list_id)
+        sql += ' ORDER BY lists_item_fts.rowid LIMIT %s'
+        return _fetch(self.using, sql, params + [limit])
+
+    def rebuild(self, chunk_size=CHUNK_SIZE):
+        indexed = 0
+        rows = iter_items(chunk_size=chunk_size)
+        with transaction.atomic(using=self.using), \
+                connections[self.using].cursor() as cursor:
+            cursor.execute(
+                "INSERT INTO lists_item_fts(lists_item_fts) VALUES ('delete-all')")
+            for chunk in iter(lambda: list(islice(rows, chunk_size)), []):
+                cursor.executemany(
+                    'INSERT INTO lists_item_fts(rowid, text) VALUES (%s, %s)',
+                    [(id_, text) for id_, _, text in chunk])
+                indexed += len(chunk)
+        return indexed
+
+
+class TrigramIndex:
+
+    def __init__(self, using='default'):
+        self.using = using
+
+    def search(self, query_words, list_id, limit):
+        sql = 'SELECT id, list_id, text FROM lists_item WHERE '
+        sql += ' AND '.join(['text ILIKE %s'] * len(query_words))
+        params = ['%' + word.replace('_', '\\_') + '%' for word in query_words]
+        if list_id is not None:
+            sql += ' AND list_id = %s'
+            params.append(list_id)
+        sql += ' ORDER BY id LIMIT %s'
+        return _fetch(self.using, sql, params + [limit])
+
+    def rebuild(self, chunk_size=CHUNK_SIZE):
+        with connections[self.using].cursor() as cursor:
+            cursor.execute('REINDEX INDEX lists_item_text_trgm')
+        return Item.objects.using(self.using).count()
+
+
+class InvertedIndex:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._clear()
+
+    def _clear(self):
+        self._built = False
+        self._postings = {}  # word -> ids of the items containing it
+        self._items = {}  # item id -> (list id, words)
+
+    def _add(self, id_, list_id, text):
+        item_words = set(words(text))
+        self._items[id_] = (list_id, item_words)
+        for word in item_words:
+            self._postings.setdefault(word, set()).add(id_)
+
+    def _remove(self, id_):
+        _, item_words = self._items.pop(id_, (None, ()))
+        for word in item_words:
+            self._postings[word].discard(id_)
+
+    def _rebuild(self, chunk_size):
+        self._clear()
+        for id_, list_id, text in iter_items(chunk_size=chunk_size):
+            self._add(id_, list_id, text)
+        self._built = True
+        return len(self._items)
+
+    def rebuild(self, chunk_size=CHUNK_SIZE):
+        with self._lock:
+            return self._rebuild(chunk_size)
+
+    def reset(self):
+        """Forget everything; the index is rebuilt by the next search."""
+        with self._lock:
+            self._clear()
+
+    def add(self, item):
+        with self._lock:
+            if self._built:
+                self._remove(item.id)
+                self._add(item.id, item.list_id, item.text)
+
+    def remove(self, item_id):
+        with self._lock:
+            self._remove(item_id)
+
+    def search(self, query_words, list_id, limit):
+        with self._lock:
+            if not self._built:
+                self._rebuild(CHUNK_SIZE)
+            postings = [self._postings.get(word, set()) for word in query_words]
+            ids = set.intersection(*postings)
+            if list_id is not None:
+                ids = {id_ for id_ in ids if self._items[id_][0] == list_id}
+        ids = heapq.nsmallest(limit, ids)
+        return list(
+            Item.objects.filter(id__in=ids).values_list('id', 'list_id', 'text'))
+
+
+inverted_index = InvertedIndex()
+
+
+def get_index(using='default'):
+    connection = connections[using]
+    if connection.vendor == 'sqlite' and sqlite_has_fts5():
+        return Fts5Index(using)
+    if connection.vendor == 'postgresql':
+        return TrigramIndex(using)
+    return inverted_index
+
+
+def search(query, list_id=None, limit=SEARCH_LIMIT):
+    """Return up to limit (id, list_id, text) rows for items matching query."""
+    query_words = words(query)
+    if not query_words:
+        return []
+    return get_index().search(query_words, list_id, limit)
+
+
+def item_saved(item):
+    if get_index() is inverted_index:
+        inverted_index.add(item)
+
+
+def item_deleted(item):
+    if get_index() is inverted_index:
+        inverted_index.remove(item.id)
+
+
+def items_changed():
+    """Call after bulk writes, which bypass the Item signals."""
+    if get_index() is inverted_index:
+        inverted_index.reset()
@@ -0,0 +1,44 @@
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from lists import cache, search
+from lists.models import Item, List, last_item_id_subquery
+
+
+def invalidate(list_id):
+    # Bump again on commit so a table rendered from the pre-commit state
+    # during the transaction is never served under the new version.
+    cache.bump_version(list_id)
+    transaction.on_commit(lambda: cache.bump_version(list_id))
+
+
+def contents_changed(list_id, added=0, removed=0):
+    """Record a change to a list's items and keep its summary columns in
+    step. Call this after bulk writes, which bypass the model signals below."""
+    List.objects.filter(id=list_id).update(
+        version=F('version') + 1,
+        modified=timezone.now(),
+        item_count=F('item_count') + added - removed,
+        last_item_id=last_item_id_subquery(),
+    )
+    invalidate(list_id)
+
+
+@receiver(post_save, sender=List)
+def list_saved(sender, instance, **kwargs):
+    invalidate(instance.id)
+
+
+@receiver(post_save, sender=Item)
+def item_saved(sender, instance, created, **kwargs):
+    contents_changed(instance.list_id, added=int(created))
+    search.item_saved(instance)
+
+
+@receiver(post_delete, sender=Item)
+def item_deleted(sender, instance, **kwargs):
+    contents_changed(instance.list_id, removed=1)
+    search.item_deleted(instance)
@@ -5,4 +5,20 @@ window.Superlists.initialize = function () {
         $('.has-error').hide();
     }
    );
+  $('#id_load_more').on('click', function (event) {
+    event.preventDefault();
+    var link = $(this);
+    $.getJSON(link.data('url'), function (page) {
+      page.items.forEach(function (item) {
+        $('#id_list_table').append(
+          $('<tr>').append($('<td>').text(item.number + ': ' + item.text))
+        );
+      });
+      if (page.next) {
+        link.data('url', page.next);
+      } else {
+        link.remove();
+      }
+    });
+  });
 };
@@ -0,0 +1,44 @@
+from django.urls import reverse
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+from lists.export import CHUNK_SIZE, iter_items
+
+TABLE_START = '<table id="id_list_table" class="table">\n    '
+ROW = '\n      <tr><td>{}: {}</td></tr>\n    '
+TABLE_END = '\n  </table>\n  '
+LOAD_MORE = ('\n    <a id="id_load_more" href="?{query}"\n'
+             '       data-url="{url}?{query}">Load more</a>\n  ')
+
+
+def render_table(list_id, rows, start, next_page):
+    """Render one page of the item table for (id, text) rows, numbering
+    them from start + 1 and linking to next_page (a query string) if given.
+    Built without the template engine, which is several times slower for
+    large pages (see benchmarks/table_render.py)."""
+    parts = [TABLE_START]
+    parts.extend(
+        ROW.format(number, escape(text))
+        for number, (_, text) in enumerate(rows, start=start + 1)
+    )
+    parts.append(TABLE_END)
+    if next_page:
+        parts.append(LOAD_MORE.format(
+            query=escape(next_page),
+            url=escape(reverse('list_items', args=[list_id])),
+        ))
+    parts.append('\n')
+    return mark_safe(''.join(parts))
+
+
+def stream_table(list_id, chunk_size=CHUNK_SIZE):
+    """Yield the table for every item in the list, one string per
+    chunk_size rows, in the same markup as render_table."""
+    parts = [TABLE_START]
+    items = iter_items(list_id, chunk_size=chunk_size)
+    for number, (_, _, text) in enumerate(items, start=1):
+        parts.append(ROW.format(number, escape(text)))
+        if number % chunk_size == 0:
+            yield ''.join(parts)
+            parts = []
+    parts.append(TABLE_END + '\n')
+    yield ''.join(parts)
@@ -0,0 +1,94 @@
+import os
+import re
+import tempfile
+from collections import Counter
+from contextlib import contextmanager
+
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from lists.models import Item, List
+
+LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+\b")
+TRANSACTION_CONTROL = ('SAVEPOINT', 'RELEASE SAVEPOINT', 'ROLLBACK TO SAVEPOINT')
+
+
+def query_shape(sql):
+    return LITERAL.sub('?', sql)
+
+
+class QueryBudgetTestCase(TestCase):
+    """Helpers for pinning how many queries a code path may run."""
+
+    def setUp(self):
+        caches['lists'].clear()
+
+    def make_list(self, size):
+        list_ = List.objects.create()
+        Item.objects.bulk_create(
+            Item(list=list_, text=f'item {n}') for n in range(size))
+        List.objects.filter(id=list_.id).rebuild_stats()
+        return list_
+
+    @contextmanager
+    def assertQueryBudget(self, budget):
+        """Fail if the block runs more than budget queries, or runs the
+        same query shape twice (the signature of a per-row lazy load)."""
+        with CaptureQueriesContext(connection) as context:
+            yield context
+        queries = [query['sql'] for query in context.captured_queries]
+        listing = '\n'.join(queries)
+        self.assertLessEqual(
+            len(queries), budget,
+            f'{len(queries)} queries run, budget is {budget}:\n{listing}')
+        shapes = Counter(
+            query_shape(sql) for sql in queries
+            if not sql.startswith(TRANSACTION_CONTROL))
+        repeated = [shape for shape, count in shapes.items() if count > 1]
+        self.assertEqual(
+            repeated, [], f'repeated queries suggest an N+1:\n{listing}')
+
+    def assertConstantQueries(self, make_request, sizes=(0, 1, 10, 50)):
+        """Fail unless make_request(list_) runs the same number of queries
+        for lists of every size."""
+        counts = {}
+        for size in sizes:
+            list_ = self.make_list(size)
+            caches['lists'].clear()
+            with CaptureQueriesContext(connection) as context:
+                make_request(list_)
+            counts[size] = len(context.captured_queries)
+        self.assertEqual(
+            len(set(counts.values())), 1,
+            f'query count grows with list size: {counts}')
+        return counts[sizes[0]]
+
+
+class OnDiskDatabaseTestCase(TransactionTestCase):
+    """Runs on SQLite against a migrated database file of its own. Threads
+    can then write at once the way gunicorn workers do: connections to the
+    shared in-memory test database fail with "database table is locked"
+    instead of waiting for each other."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.memory_db = None
+        if connection.vendor == 'sqlite':
+            cls.tmp = tempfile.TemporaryDirectory()
+            # set aside rather than closed, which would discard its contents
+            cls.memory_db = (connection.settings_dict['NAME'], connection.connection)
+            connection.connection = None
+            connection.settings_dict['NAME'] = os.path.join(
+                cls.tmp.name, 'db.sqlite3')
+            call_command('migrate', verbosity=0, interactive=False)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        if cls.memory_db is not None:
+            connection.close()
+            connection.settings_dict['NAME'], connection.connection = cls.memory_db
+            cls.tmp.cleanup()
@@ -0,0 +1,154 @@
+import json
+
+from django.test import TestCase
+from lists.forms import DUPLICATE_ITEM_ERROR, EMPTY_ITEM_ERROR
+from lists.models import Item, List
+
+
+class APITestCase(TestCase):
+
+    def post_json(self, url, data):
+        return self.client.post(
+            url, data=json.dumps(data), content_type='application/json')
+
+
+class CreateListAPITest(APITestCase):
+
+    def test_creates_list_with_first_item(self):
+        response = self.post_json('/api/lists/', {'text': 'first'})
+        self.assertEqual(response.status_code, 201)
+        list_ = List.objects.get()
+        item = Item.objects.get()
+        self.assertEqual(response.json(), {
+            'id': list_.id, 'items': [{'id': item.id, 'text': 'first'}]})
+
+    def test_payload_is_compact(self):
+        response = self.post_json('/api/lists/', {'text': 'first'})
+        self.assertNotIn(b', ', response.content)
+        self.assertNotIn(b': ', response.content)
+
+    def test_empty_item_is_rejected(self):
+        response = self.post_json('/api/lists/', {'text': ''})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'errors': {'text': [EMPTY_ITEM_ERROR]}})
+        self.assertEqual(List.objects.count(), 0)
+
+    def test_rejects_non_json(self):
+        response = self.client.post(
+            '/api/lists/', data='text=x', content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_creates_list_with_many_items(self):
+        response = self.post_json('/api/lists/', {'items': ['one', 'two']})
+        self.assertEqual(response.status_code, 201)
+        list_ = List.objects.get()
+        self.assertEqual(response.json(), {'id': list_.id, 'items': [
+            {'id': item.id, 'text': item.text} for item in list_.item_set.all()]})
+        self.assertEqual(list_.item_set.count(), 2)
+
+    def test_creates_list_with_more_items_than_one_insert_can_hold(self):
+        texts = [f'item {n}' for n in range(600)]
+        response = self.post_json('/api/lists/', {'items': texts})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.json()['items']), 600)
+
+    def test_rejects_whole_list_if_any_item_is_invalid(self):
+        response = self.post_json('/api/lists/', {'items': ['one', '', 'one']})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'errors': {'items': [
+            {'line': 2, 'text': '', 'error': EMPTY_ITEM_ERROR},
+            {'line': 3, 'text': 'one', 'error': DUPLICATE_ITEM_ERROR},
+        ]}})
+        self.assertEqual(List.objects.count(), 0)
+
+    def test_rejects_empty_items(self):
+        response = self.post_json('/api/lists/', {'items': []})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(List.objects.count(), 0)
+
+
+class ItemsAPITest(APITestCase):
+
+    def test_adds_an_item_without_redirecting(self):
+        list_ = List.objects.create()
+        response = self.post_json(f'/api/lists/{list_.id}/items', {'text': 'new'})
+        self.assertEqual(response.status_code, 201)
+        item = Item.objects.get()
+        self.assertEqual(response.json(), {'id': item.id, 'text': 'new'})
+        self.assertEqual(item.list, list_)
+
+    def test_duplicate_item_is_rejected(self):
+        list_ = List.objects.create()
+        Item.objects.create(list=list_, text='twin')
+        response = self.post_json(f'/api/lists/{list_.id}/items', {'text': 'twin'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json(), {'errors': {'text': [DUPLICATE_ITEM_ERROR]}})
+
+    def test_adds_several_items(self):
+        list_ = List.objects.create()
+        response = self.post_json(
+            f'/api/lists/{list_.id}/items', {'items': ['one', 'two', '']})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json(), {'created': 2, 'errors': [
+            {'line': 3, 'text': '', 'error': EMPTY_ITEM_ERROR}]})
+
+    def test_rejects_empty_items_with_an_error(self):
+        list_ = List.objects.create()
+        response = self.post_json(f'/api/lists/{list_.id}/items', {'items': []})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {
+            'errors': {'items': ['Expected a list of item texts']}})
+
+    def test_reports_errors_when_every_item_is_blank(self):
+        list_ = List.objects.create()
+        response = self.post_json(
+            f'/api/lists/{list_.id}/items', {'items': ['', ' ']})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'created': 0, 'errors': [
+            {'line': 1, 'text': '', 'error': EMPTY_ITEM_ERROR},
+            {'line': 2, 'text': ' ', 'error': EMPTY_ITEM_ERROR},
+        ]})
+
+    def test_fetches_items_by_cursor(self):
+        list_ = List.objects.create()
+        first = Item.objects.create(list=list_, text='one')
+        second = Item.objects.create(list=list_, text='two')
+        response = self.client.get(
+            f'/api/lists/{list_.id}/items', {'after': first.id, 'start': 1})
+        self.assertEqual(response.json(), {
+            'items': [{'id': second.id, 'number': 2, 'text': 'two'}],
+            'next': None,
+            'count': 2,
+        })
+
+    def test_404s_for_missing_list(self):
+        response = self.post_json('/api/lists/999/items', {'text': 'new'})
+        self.assertEqual(response.status_code, 404)
+
+
+class ItemAPITest(TestCase):
+
+    def test_deletes_item(self):
+        list_ = List.objects.create()
+        item = Item.objects.create(list=list_, text='gone')
+        response = self.client.delete(f'/api/lists/{list_.id}/items/{item.id}')
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(Item.objects.count(), 0)
+        list_.refresh_from_db()
+        self.assertEqual(list_.item_count, 0)
+
+    def test_cannot_delete_item_through_another_list(self):
+        list_ = List.objects.create()
+        other_list = List.objects.create()
+        item = Item.objects.create(list=list_, text='stays')
+        response = self.client.delete(
+            f'/api/lists/{other_list.id}/items/{item.id}')
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(Item.objects.count(), 1)
+
+    def test_only_accepts_delete(self):
+        list_ = List.objects.create()
+        item = Item.objects.create(list=list_, text='stays')
+        response = self.client.get(f'/api/lists/{list_.id}/items/{item.id}')
+        self.assertEqual(response.status_code, 405)
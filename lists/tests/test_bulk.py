@@ -0,0 +1,187 @@
+import json
+import tempfile
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.db import IntegrityError
+from django.test import TestCase
+from lists.bulk import create_list_with_items, import_items
+from lists.forms import DUPLICATE_ITEM_ERROR, EMPTY_ITEM_ERROR, find_duplicates
+from lists.models import Item, List
+
+
+class ImportItemsTest(TestCase):
+
+    def test_creates_items_in_order(self):
+        list_ = List.objects.create()
+        created, errors = import_items(list_, ['one', 'two', 'three'])
+        self.assertEqual(created, 3)
+        self.assertEqual(errors, [])
+        self.assertEqual(
+            [item.text for item in list_.item_set.all()], ['one', 'two', 'three'])
+
+    def test_reports_empty_and_duplicate_lines(self):
+        list_ = List.objects.create()
+        Item.objects.create(list=list_, text='old')
+        created, errors = import_items(list_, ['new', '  ', 'old', 'new'])
+        self.assertEqual(created, 1)
+        self.assertEqual(errors, [
+            {'line': 2, 'text': '  ', 'error': EMPTY_ITEM_ERROR},
+            {'line': 3, 'text': 'old', 'error': DUPLICATE_ITEM_ERROR},
+            {'line': 4, 'text': 'new', 'error': DUPLICATE_ITEM_ERROR},
+        ])
+
+    def test_reports_duplicates_added_after_the_check(self):
+        list_ = List.objects.create()
+        Item.objects.create(list=list_, text='old')
+        checks = []
+
+        def stale_first_check(for_list, texts):
+            # as if another request added 'old' between the check and the insert
+            checks.append(texts)
+            return set() if len(checks) == 1 else find_duplicates(for_list, texts)
+
+        with patch('lists.bulk.find_duplicates', stale_first_check):
+            created, errors = import_items(list_, ['new', 'old', 'newer'])
+        self.assertEqual(created, 2)
+        self.assertEqual(errors, [
+            {'line': 2, 'text': 'old', 'error': DUPLICATE_ITEM_ERROR}])
+        self.assertEqual(
+            [item.text for item in list_.item_set.all()], ['old', 'new', 'newer'])
+        list_.refresh_from_db()
+        self.assertEqual(list_.item_count, 3)
+
+    def test_reraises_integrity_errors_other_than_duplicates(self):
+        list_ = List.objects.create()
+        error = IntegrityError('NOT NULL constraint failed: lists_item.list_id')
+        with patch('lists.models.Item.save', side_effect=error), \
+                patch('lists.bulk.Item.objects.bulk_create', side_effect=error):
+            with self.assertRaises(IntegrityError):
+                import_items(list_, ['one'])
+
+    def test_duplicates_in_other_lists_are_fine(self):
+        other_list = List.objects.create()
+        Item.objects.create(list=other_list, text='bla')
+        list_ = List.objects.create()
+        created, errors = import_items(list_, ['bla'])
+        self.assertEqual(created, 1)
+
+    def test_uses_a_constant_number_of_queries_per_batch(self):
+        list_ = List.objects.create()
+        lines = [f'item {n}' for n in range(50)]
+        # savepoint, duplicate check, savepoint, insert, release,
+        # list version bump, release
+        with self.assertNumQueries(7):
+            import_items(list_, lines, batch_size=50)
+
+    def test_imports_more_rows_than_one_insert_can_hold(self):
+        list_ = List.objects.create()
+        created, errors = import_items(list_, [f'item {n}' for n in range(1200)])
+        self.assertEqual((created, errors), (1200, []))
+        self.assertEqual(list_.item_set.count(), 1200)
+
+    def test_bumps_list_version(self):
+        list_ = List.objects.create()
+        import_items(list_, ['one', 'two'])
+        list_.refresh_from_db()
+        self.assertEqual(list_.version, 1)
+
+
+class BulkAddItemsViewTest(TestCase):
+
+    def test_accepts_newline_delimited_text(self):
+        list_ = List.objects.create()
+        response = self.client.post(
+            f'/lists/{list_.id}/items/bulk', data='one\ntwo\n',
+            content_type='text/plain')
+        self.assertEqual(response.json(), {'created': 2, 'errors': []})
+        self.assertEqual(list_.item_set.count(), 2)
+
+    def test_accepts_large_imports(self):
+        list_ = List.objects.create()
+        response = self.client.post(
+            f'/lists/{list_.id}/items/bulk',
+            data='\n'.join(f'item {n}' for n in range(600)),
+            content_type='text/plain')
+        self.assertEqual(response.json(), {'created': 600, 'errors': []})
+
+    def test_accepts_json(self):
+        list_ = List.objects.create()
+        response = self.client.post(
+            f'/lists/{list_.id}/items/bulk',
+            data=json.dumps({'items': ['one', '']}),
+            content_type='application/json')
+        self.assertEqual(response.json(), {'created': 1, 'errors': [
+            {'line': 2, 'text': '', 'error': EMPTY_ITEM_ERROR}]})
+
+    def test_rejects_empty_import_with_an_error(self):
+        list_ = List.objects.create()
+        for data, content_type in [('', 'text/plain'),
+                                   ('{"items": []}', 'application/json')]:
+            response = self.client.post(
+                f'/lists/{list_.id}/items/bulk', data=data,
+                content_type=content_type)
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.json(), {'created': 0, 'errors': [
+                {'line': 1, 'text': '', 'error': EMPTY_ITEM_ERROR}]})
+
+    def test_rejects_blank_lines_with_errors(self):
+        list_ = List.objects.create()
+        response = self.client.post(
+            f'/lists/{list_.id}/items/bulk', data='\n  \n',
+            content_type='text/plain')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'created': 0, 'errors': [
+            {'line': 1, 'text': '', 'error': EMPTY_ITEM_ERROR},
+            {'line': 2, 'text': '  ', 'error': EMPTY_ITEM_ERROR},
+        ]})
+
+    def test_rejects_malformed_json(self):
+        list_ = List.objects.create()
+        response = self.client.post(
+            f'/lists/{list_.id}/items/bulk', data='{',
+            content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_404s_for_missing_list(self):
+        response = self.client.post(
+            '/lists/999/items/bulk', data='one', content_type='text/plain')
+        self.assertEqual(response.status_code, 404)
+
+    def test_new_items_show_on_list_page(self):
+        list_ = List.objects.create()
+        self.client.get(f'/lists/{list_.id}/')
+        self.client.post(
+            f'/lists/{list_.id}/items/bulk', data='one', content_type='text/plain')
+        self.assertContains(self.client.get(f'/lists/{list_.id}/'), '1: one')
+
+
+class ImportItemsCommandTest(TestCase):
+
+    def test_imports_file_and_reports_errors(self):
+        list_ = List.objects.create()
+        with tempfile.NamedTemporaryFile('w', suffix='.txt') as f:
+            f.write('one\n\ntwo\none\n')
+            f.flush()
+            out, err = StringIO(), StringIO()
+            call_command('import_items', list_.id, f.name, stdout=out, stderr=err)
+        self.assertEqual(list_.item_set.count(), 2)
+        self.assertIn('Imported 2 items, 2 rejected', out.getvalue())
+        self.assertIn(f'line 2: {EMPTY_ITEM_ERROR}', err.getvalue())
+
+
+class CreateListWithItemsTest(TestCase):
+
+    def test_creates_list_and_items(self):
+        list_, errors = create_list_with_items(['one', 'two'])
+        self.assertEqual(errors, [])
+        self.assertEqual([item.text for item in list_.item_set.all()], ['one', 'two'])
+        list_.refresh_from_db()
+        self.assertEqual(list_.item_count, 2)
+
+    def test_creates_nothing_if_any_text_is_invalid(self):
+        list_, errors = create_list_with_items(['one', ' '])
+        self.assertIsNone(list_)
+        self.assertEqual(errors, [{'line': 2, 'text': ' ', 'error': EMPTY_ITEM_ERROR}])
+        self.assertEqual(List.objects.count(), 0)
@@ -0,0 +1,112 @@
+import shutil
+import tempfile
+import threading
+
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from lists import cache as list_cache
+from lists.cache import LRUCache
+from lists.forms import ExistingListItemForm, ItemForm
+from lists.models import Item, List
+
+
+class LRUCacheTest(TestCase):
+
+    def test_evicts_least_recently_used_key(self):
+        cache = LRUCache(self.id(), {'OPTIONS': {'MAX_ENTRIES': 2}})
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), 3)
+
+    def test_add_does_not_overwrite(self):
+        cache = LRUCache(self.id(), {})
+        self.assertTrue(cache.add('a', 1))
+        self.assertFalse(cache.add('a', 2))
+        self.assertEqual(cache.get('a'), 1)
+
+    def test_expired_keys_are_misses(self):
+        cache = LRUCache(self.id(), {})
+        cache.set('a', 1, timeout=-1)
+        self.assertIsNone(cache.get('a'))
+
+    def test_instances_with_the_same_location_share_entries(self):
+        LRUCache(self.id(), {}).set('a', 1)
+        self.assertEqual(LRUCache(self.id(), {}).get('a'), 1)
+
+
+class ListVersionTest(TestCase):
+
+    def test_item_form_save_bumps_version(self):
+        list_ = List.objects.create()
+        version = list_cache.get_version(list_.id)
+        ItemForm(data={'text': 'do me'}).save(for_list=list_)
+        self.assertNotEqual(list_cache.get_version(list_.id), version)
+
+    def test_existing_list_item_form_save_bumps_version(self):
+        list_ = List.objects.create()
+        version = list_cache.get_version(list_.id)
+        form = ExistingListItemForm(for_list=list_, data={'text': 'do me'})
+        form.is_valid()
+        form.save()
+        self.assertNotEqual(list_cache.get_version(list_.id), version)
+
+    def test_version_bump_on_another_thread_is_seen(self):
+        list_ = List.objects.create()
+        version = list_cache.get_version(list_.id)
+        thread = threading.Thread(target=list_cache.bump_version, args=[list_.id])
+        thread.start()
+        thread.join()
+        self.assertNotEqual(list_cache.get_version(list_.id), version)
+
+    @override_settings(CACHES={'lists': {
+        'BACKEND': 'lists.cache.LRUCache', 'LOCATION': 'expiring', 'TIMEOUT': 0}})
+    def test_versions_expire_with_the_cache_timeout(self):
+        # so writes by other processes are picked up eventually
+        version = list_cache.get_version(1)
+        self.assertNotEqual(list_cache.get_version(1), version)
+
+    def test_version_is_stable_without_writes(self):
+        list_ = List.objects.create()
+        self.assertEqual(
+            list_cache.get_version(list_.id), list_cache.get_version(list_.id))
+
+
+class CachedListViewTest(TestCase):
+
+    def setUp(self):
+        caches['lists'].clear()
+
+    def test_cache_hit_does_not_touch_the_database(self):
+        list_ = List.objects.create()
+        Item.objects.create(list=list_, text='itemey1')
+        self.client.get(f'/lists/{list_.id}/')
+        with self.assertNumQueries(0):
+            response = self.client.get(f'/lists/{list_.id}/')
+        self.assertContains(response, '1: itemey1')
+        self.assertEqual(response.context['list'], list_)
+
+    def test_new_items_show_up_after_POST(self):
+        list_ = List.objects.create()
+        self.client.get(f'/lists/{list_.id}/')
+        self.client.post(f'/lists/{list_.id}/', data={'text': 'new item'})
+        response = self.client.get(f'/lists/{list_.id}/')
+        self.assertContains(response, '1: new item')
+
+    def test_file_based_backend_serves_cached_tables(self):
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        file_cache = {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': cache_dir,
+        }
+        with override_settings(CACHES={'default': file_cache, 'lists': file_cache}):
+            list_ = List.objects.create()
+            Item.objects.create(list=list_, text='itemey1')
+            self.client.get(f'/lists/{list_.id}/')
+            with self.assertNumQueries(0):
+                response = self.client.get(f'/lists/{list_.id}/')
+        self.assertContains(response, '1: itemey1')
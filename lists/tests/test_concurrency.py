@@ -0,0 +1,58 @@
+import threading
+from collections import Counter
+
+from django.db import connections
+from django.test import Client
+from django.utils.html import escape
+from lists.forms import DUPLICATE_ITEM_ERROR
+from lists.models import Item, List
+from lists.tests.base import OnDiskDatabaseTestCase
+
+THREADS = 16
+
+
+class ConcurrentItemPOSTTest(OnDiskDatabaseTestCase):
+
+    def post_concurrently(self, list_, texts):
+        barrier = threading.Barrier(len(texts))
+        results = []
+
+        def post(text):
+            client = Client()
+            try:
+                barrier.wait()
+                response = client.post(f'/lists/{list_.id}/', data={'text': text})
+                results.append((response.status_code, response.content.decode()))
+            except Exception as e:
+                # the test client re-raises what would have been a 500
+                results.append((500, repr(e)))
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=post, args=(text,)) for text in texts]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_same_text_is_added_once_and_reported_as_duplicate(self):
+        list_ = List.objects.create()
+        results = self.post_concurrently(list_, ['same'] * THREADS)
+        self.assertEqual(
+            Counter(status for status, _ in results), {302: 1, 200: THREADS - 1},
+            results)
+        for status, content in results:
+            if status == 200:
+                self.assertIn(escape(DUPLICATE_ITEM_ERROR), content)
+        self.assertEqual(Item.objects.filter(list=list_).count(), 1)
+
+    def test_different_texts_are_all_added(self):
+        list_ = List.objects.create()
+        results = self.post_concurrently(
+            list_, [f'item {n}' for n in range(THREADS)])
+        self.assertEqual(
+            [status for status, _ in results], [302] * THREADS, results)
+        list_.refresh_from_db()
+        self.assertEqual(list_.item_count, THREADS)
+        self.assertEqual(list_.version, THREADS)
@@ -0,0 +1,71 @@
+import json
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from lists.export import iter_items
+from lists.models import Item, List
+
+
+class IterItemsTest(TestCase):
+
+    def test_pages_through_all_items_in_order(self):
+        list_ = List.objects.create()
+        items = [Item.objects.create(list=list_, text=str(n)) for n in range(5)]
+        with self.assertNumQueries(3):
+            rows = list(iter_items(chunk_size=2))
+        self.assertEqual([row[0] for row in rows], [item.id for item in items])
+
+    def test_filters_by_list_and_since_id(self):
+        list1 = List.objects.create()
+        list2 = List.objects.create()
+        first = Item.objects.create(list=list1, text='a')
+        Item.objects.create(list=list2, text='b')
+        last = Item.objects.create(list=list1, text='c')
+        rows = list(iter_items(list_id=list1.id, since_id=first.id))
+        self.assertEqual(rows, [(last.id, list1.id, 'c')])
+
+
+class ExportListViewTest(TestCase):
+
+    def test_streams_ndjson(self):
+        list_ = List.objects.create()
+        item = Item.objects.create(list=list_, text='itemey1')
+        Item.objects.create(list=List.objects.create(), text='other')
+        response = self.client.get(f'/lists/{list_.id}/export')
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(
+            [json.loads(line) for line in lines],
+            [{'id': item.id, 'list': list_.id, 'text': 'itemey1'}]
+        )
+
+    def test_since_id(self):
+        list_ = List.objects.create()
+        first = Item.objects.create(list=list_, text='a')
+        Item.objects.create(list=list_, text='b')
+        response = self.client.get(
+            f'/lists/{list_.id}/export', {'since_id': first.id})
+        content = b''.join(response.streaming_content).decode()
+        self.assertEqual([json.loads(l)['text'] for l in content.splitlines()], ['b'])
+
+    def test_404s_for_missing_list(self):
+        response = self.client.get('/lists/999/export')
+        self.assertEqual(response.status_code, 404)
+
+
+class ExportListsCommandTest(TestCase):
+
+    def test_exports_every_list(self):
+        list1 = List.objects.create()
+        list2 = List.objects.create()
+        Item.objects.create(list=list1, text='a')
+        Item.objects.create(list=list2, text='b')
+        out = StringIO()
+        call_command('export_lists', stdout=out)
+        rows = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(
+            [(row['list'], row['text']) for row in rows],
+            [(list1.id, 'a'), (list2.id, 'b')]
+        )
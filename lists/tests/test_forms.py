@@ -1,7 +1,10 @@
+from unittest.mock import patch
+
+from django.db import IntegrityError
 from django.test import TestCase
 from lists.forms import (
     ItemForm, EMPTY_ITEM_ERROR, DUPLICATE_ITEM_ERROR,
-    ExistingListItemForm
+    ExistingListItemForm, find_duplicates
 )
 from lists.models import Item, List
 from unittest import skip
@@ -62,3 +65,50 @@ class ExistingListItemFormTest(TestCase):
         form = ExistingListItemForm(for_list=list_, data={'text': 'no twins!'})
         self.assertFalse(form.is_valid())
         self.assertEqual(form.errors['text'], [DUPLICATE_ITEM_ERROR])
+
+    def test_deferred_unique_check_skips_the_duplicate_query(self):
+        list_ = List.objects.create()
+        form = ExistingListItemForm(
+            for_list=list_, data={'text': 'new'}, defer_unique=True)
+        with self.assertNumQueries(0):
+            self.assertTrue(form.is_valid())
+
+    def test_deferred_unique_check_reports_duplicates_on_save(self):
+        list_ = List.objects.create()
+        Item.objects.create(list=list_, text='no twins!')
+        form = ExistingListItemForm(
+            for_list=list_, data={'text': 'no twins!'}, defer_unique=True)
+        self.assertTrue(form.is_valid())
+        self.assertIsNone(form.save())
+        self.assertEqual(form.errors['text'], [DUPLICATE_ITEM_ERROR])
+        self.assertEqual(Item.objects.count(), 1)
+
+    def test_deferred_unique_check_reraises_other_integrity_errors(self):
+        list_ = List.objects.create()
+        form = ExistingListItemForm(
+            for_list=list_, data={'text': 'do me'}, defer_unique=True)
+        form.is_valid()
+        error = IntegrityError('NOT NULL constraint failed: lists_item.list_id')
+        with patch('lists.models.Item.save', side_effect=error):
+            with self.assertRaises(IntegrityError):
+                form.save()
+        self.assertNotIn('text', form.errors)
+
+    def test_deferred_unique_check_saves_new_items(self):
+        list_ = List.objects.create()
+        form = ExistingListItemForm(
+            for_list=list_, data={'text': 'do me'}, defer_unique=True)
+        form.is_valid()
+        self.assertEqual(form.save(), Item.objects.get())
+
+
+class FindDuplicatesTest(TestCase):
+
+    def test_finds_texts_already_in_list_with_one_query(self):
+        list_ = List.objects.create()
+        other_list = List.objects.create()
+        Item.objects.create(list=list_, text='a')
+        Item.objects.create(list=other_list, text='b')
+        with self.assertNumQueries(1):
+            duplicates = find_duplicates(list_, ['a', 'b', 'c'])
+        self.assertEqual(duplicates, {'a'})
@@ -1,6 +1,12 @@
+from io import StringIO
+
+from django.core.management import call_command
 from django.test import TestCase
 from django.core.exceptions import ValidationError
-from lists.models import Item, List
+from django.db import IntegrityError
+from lists.bulk import import_items
+from lists.forms import ExistingListItemForm, ItemForm
+from lists.models import Item, List, text_digest
 
 
 class ItemModelTest(TestCase):
@@ -48,8 +54,100 @@ class ItemModelTest(TestCase):
         )
 
 
+class ItemTextDigestTest(TestCase):
+
+    def test_digest_is_set_on_save_and_bulk_create(self):
+        list_ = List.objects.create()
+        item = Item.objects.create(list=list_, text='one')
+        Item.objects.bulk_create([Item(list=list_, text='two')])
+        self.assertEqual(item.text_digest, text_digest('one'))
+        self.assertEqual(
+            Item.objects.get(text='two').text_digest, text_digest('two'))
+
+    def test_digest_follows_text_changes(self):
+        item = Item.objects.create(list=List.objects.create(), text='one')
+        item.text = 'two'
+        item.save()
+        item.refresh_from_db()
+        self.assertEqual(item.text_digest, text_digest('two'))
+
+    def test_database_rejects_duplicate_digests(self):
+        list_ = List.objects.create()
+        Item.objects.create(list=list_, text='bla')
+        with self.assertRaises(IntegrityError):
+            Item.objects.create(list=list_, text='bla')
+
+    def test_differently_encoded_accents_are_duplicates(self):
+        list_ = List.objects.create()
+        Item.objects.create(list=list_, text='caf\u00e9')
+        with self.assertRaises(ValidationError):
+            Item(list=list_, text='cafe\u0301').full_clean()
+
+    def test_long_texts_have_fixed_size_digests(self):
+        item = Item.objects.create(list=List.objects.create(), text='x' * 100000)
+        self.assertEqual(len(item.text_digest), 64)
+
+
 class ListModelTest(TestCase):
 
     def test_get_absolute_url(self):
         list_ = List.objects.create()
         self.assertEqual(list_.get_absolute_url(), f'/lists/{list_.id}/')
+
+    def test_adding_and_deleting_items_bumps_version(self):
+        list_ = List.objects.create()
+        item = Item.objects.create(list=list_, text='bla')
+        list_.refresh_from_db()
+        self.assertEqual(list_.version, 1)
+        item.delete()
+        list_.refresh_from_db()
+        self.assertEqual(list_.version, 2)
+
+    def test_etag_is_derived_from_version(self):
+        list_ = List.objects.create()
+        etag = list_.etag
+        Item.objects.create(list=list_, text='bla')
+        list_.refresh_from_db()
+        self.assertNotEqual(list_.etag, etag)
+
+
+class ListStatsTest(TestCase):
+
+    def assertStats(self, list_, item_count, last_item_id):
+        list_.refresh_from_db()
+        self.assertEqual(list_.item_count, item_count)
+        self.assertEqual(list_.last_item_id, last_item_id)
+
+    def test_form_saves_update_stats(self):
+        list_ = List.objects.create()
+        self.assertStats(list_, 0, None)
+        first = ItemForm(data={'text': 'one'})
+        first.is_valid()
+        first = first.save(for_list=list_)
+        second = ExistingListItemForm(for_list=list_, data={'text': 'two'})
+        second.is_valid()
+        second = second.save()
+        self.assertStats(list_, 2, second.id)
+
+    def test_deleting_last_item_moves_last_item_id_back(self):
+        list_ = List.objects.create()
+        first = Item.objects.create(list=list_, text='one')
+        second = Item.objects.create(list=list_, text='two')
+        second.delete()
+        self.assertStats(list_, 1, first.id)
+
+    def test_bulk_import_updates_stats(self):
+        list_ = List.objects.create()
+        import_items(list_, ['one', 'two', 'three'])
+        self.assertStats(list_, 3, Item.objects.last().id)
+
+    def test_rebuild_list_stats_repairs_drift(self):
+        list_ = List.objects.create()
+        item = Item.objects.create(list=list_, text='one')
+        empty_list = List.objects.create()
+        List.objects.update(item_count=42, last_item_id=42)
+        out = StringIO()
+        call_command('rebuild_list_stats', batch_size=1, stdout=out)
+        self.assertStats(list_, 1, item.id)
+        self.assertStats(empty_list, 0, None)
+        self.assertIn('Rebuilt stats for 2 lists', out.getvalue())
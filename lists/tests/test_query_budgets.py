@@ -0,0 +1,86 @@
+from lists.models import Item
+from lists.tables import render_table, stream_table
+from lists.tests.base import QueryBudgetTestCase
+
+
+class HomePageQueriesTest(QueryBudgetTestCase):
+
+    def test_home_page_runs_no_queries(self):
+        with self.assertQueryBudget(0):
+            self.client.get('/')
+
+
+class NewListQueriesTest(QueryBudgetTestCase):
+
+    def test_new_list(self):
+        # list insert, then savepoint, item insert, list stats update, release
+        with self.assertQueryBudget(5):
+            self.client.post('/lists/new', data={'text': 'A new list item'})
+
+    def test_invalid_new_list_runs_no_queries(self):
+        with self.assertQueryBudget(0):
+            self.client.post('/lists/new', data={'text': ''})
+
+
+class ViewListQueriesTest(QueryBudgetTestCase):
+
+    def test_GET_does_not_grow_with_list_size(self):
+        count = self.assertConstantQueries(
+            lambda list_: self.client.get(f'/lists/{list_.id}/'))
+        self.assertEqual(count, 2)
+
+    def test_GET_budget(self):
+        list_ = self.make_list(50)
+        with self.assertQueryBudget(2):
+            self.client.get(f'/lists/{list_.id}/')
+
+    def test_cached_GET_runs_no_queries(self):
+        list_ = self.make_list(50)
+        self.client.get(f'/lists/{list_.id}/')
+        with self.assertQueryBudget(0):
+            self.client.get(f'/lists/{list_.id}/')
+
+    def test_POST_does_not_grow_with_list_size(self):
+        count = self.assertConstantQueries(
+            lambda list_: self.client.post(
+                f'/lists/{list_.id}/', data={'text': 'new item'}))
+        self.assertEqual(count, 5)
+
+    def test_invalid_POST_does_not_grow_with_list_size(self):
+        self.assertConstantQueries(
+            lambda list_: self.client.post(
+                f'/lists/{list_.id}/', data={'text': ''}))
+
+    def test_list_items_json_does_not_grow_with_list_size(self):
+        count = self.assertConstantQueries(
+            lambda list_: self.client.get(f'/lists/{list_.id}/items'))
+        self.assertEqual(count, 2)
+
+
+class TableQueriesTest(QueryBudgetTestCase):
+
+    def test_rendering_rows_runs_no_queries(self):
+        list_ = self.make_list(10)
+        rows = list(Item.objects.filter(list=list_).values_list('id', 'text'))
+        with self.assertQueryBudget(0):
+            render_table(list_.id, rows, 0, 'after=1')
+
+    def test_streaming_a_chunk_of_rows_runs_one_query(self):
+        list_ = self.make_list(10)
+        with self.assertQueryBudget(1):
+            list(stream_table(list_.id, chunk_size=50))
+
+
+class QueryBudgetHelperTest(QueryBudgetTestCase):
+
+    def test_flags_per_row_lazy_loads(self):
+        list_ = self.make_list(3)
+        with self.assertRaisesRegex(AssertionError, 'N\\+1'):
+            with self.assertQueryBudget(10):
+                [item.list.id for item in Item.objects.filter(list=list_)]
+
+    def test_flags_going_over_budget(self):
+        list_ = self.make_list(1)
+        with self.assertRaisesRegex(AssertionError, 'budget is 0'):
+            with self.assertQueryBudget(0):
+                list(Item.objects.filter(list=list_))
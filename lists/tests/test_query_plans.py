@@ -0,0 +1,38 @@
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from lists.forms import find_duplicates
+from lists.models import Item, List
+from lists.views import item_page
+
+
+def query_plan(run):
+    """EXPLAIN the last query run() executes."""
+    with CaptureQueriesContext(connection) as queries:
+        run()
+    with connection.cursor() as cursor:
+        cursor.execute('EXPLAIN QUERY PLAN ' + queries[-1]['sql'])
+        return '\n'.join(row[-1] for row in cursor.fetchall())
+
+
+@skipUnless(connection.vendor == 'sqlite', 'plans are checked on SQLite')
+class ItemQueryPlanTest(TestCase):
+
+    def setUp(self):
+        self.list_ = List.objects.create()
+        Item.objects.create(list=self.list_, text='itemey')
+
+    def assertIndexSearch(self, plan, index):
+        self.assertRegex(plan, rf'SEARCH lists_item USING (COVERING )?INDEX {index}')
+        self.assertNotIn('SCAN lists_item', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_list_page_uses_list_id_index(self):
+        plan = query_plan(lambda: item_page(self.list_.id, 0, 0))
+        self.assertIndexSearch(plan, 'lists_item_list_id_id')
+
+    def test_duplicate_check_uses_unique_index(self):
+        plan = query_plan(lambda: find_duplicates(self.list_, ['a', 'b']))
+        self.assertIndexSearch(plan, r'lists_item_list_id_\w+_uniq')
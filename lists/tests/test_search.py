@@ -0,0 +1,140 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from lists import search
+from lists.bulk import import_items
+from lists.models import Item, List
+
+
+class IndexTests:
+    """Behaviour every search index shares; mixed into one TestCase per
+    index."""
+
+    def setUp(self):
+        self.list_ = List.objects.create()
+        self.other_list = List.objects.create()
+        self.milk = Item.objects.create(list=self.list_, text='Buy milk')
+        self.bread = Item.objects.create(list=self.list_, text='Buy bread')
+        self.other = Item.objects.create(list=self.other_list, text='Buy milk too')
+
+    def search(self, query, list_id=None):
+        return [row[0] for row in self.get_index().search(
+            search.words(query), list_id, search.SEARCH_LIMIT)]
+
+    def test_matches_every_word(self):
+        self.assertEqual(self.search('buy milk'), [self.milk.id, self.other.id])
+
+    def test_matches_whole_words_case_insensitively(self):
+        self.assertEqual(self.search('BREAD'), [self.bread.id])
+        self.assertEqual(self.search('bre'), [])
+
+    def test_can_be_scoped_to_a_list(self):
+        self.assertEqual(self.search('milk', self.list_.id), [self.milk.id])
+
+    def test_returns_rows(self):
+        rows = self.get_index().search(['bread'], None, 10)
+        self.assertEqual(rows, [(self.bread.id, self.list_.id, 'Buy bread')])
+
+    def test_follows_updates_and_deletes(self):
+        self.search('milk')
+        self.milk.text = 'Buy cheese'
+        self.milk.save()
+        self.other.delete()
+        self.assertEqual(self.search('milk'), [])
+        self.assertEqual(self.search('cheese'), [self.milk.id])
+
+    def test_limits_results(self):
+        rows = self.get_index().search(['buy'], None, 2)
+        self.assertEqual([row[0] for row in rows], [self.milk.id, self.bread.id])
+
+
+class DatabaseIndexTest(IndexTests, TestCase):
+
+    def get_index(self):
+        return search.get_index()
+
+    def test_indexes_bulk_imports(self):
+        import_items(self.list_, ['Buy eggs', 'Buy flour'])
+        self.assertEqual(len(self.search('buy')), 5)
+
+
+class InvertedIndexTest(IndexTests, TestCase):
+
+    def setUp(self):
+        self.index = search.InvertedIndex()
+        super().setUp()
+
+    def get_index(self):
+        return self.index
+
+    def test_follows_updates_and_deletes(self):
+        self.index.rebuild()
+        self.milk.text = 'Buy cheese'
+        self.index.add(self.milk)
+        self.index.remove(self.other.id)
+        self.assertEqual(self.search('milk'), [])
+        self.assertEqual(self.search('cheese'), [self.milk.id])
+
+    def test_builds_itself_on_first_search(self):
+        Item.objects.create(list=self.list_, text='Buy eggs')
+        self.assertEqual(len(self.search('buy')), 4)
+
+
+class SearchTest(TestCase):
+
+    def test_ignores_punctuation_and_query_syntax(self):
+        list_ = List.objects.create()
+        item = Item.objects.create(list=list_, text='fix "quotes" (now)')
+        self.assertEqual(search.search('"quotes* AND ('), [])
+        self.assertEqual(
+            search.search('"quotes" now*'), [(item.id, list_.id, item.text)])
+
+    def test_empty_query_matches_nothing(self):
+        Item.objects.create(list=List.objects.create(), text='anything')
+        self.assertEqual(search.search('  !? '), [])
+
+
+class SearchViewTest(TestCase):
+
+    def setUp(self):
+        self.list_ = List.objects.create()
+        Item.objects.create(list=self.list_, text='Buy <milk>')
+        Item.objects.create(list=List.objects.create(), text='Buy milk too')
+
+    def test_lists_matching_items_with_links(self):
+        response = self.client.get('/lists/search', {'q': 'milk'})
+        self.assertTemplateUsed(response, 'search.html')
+        self.assertContains(
+            response, f'<a href="/lists/{self.list_.id}/">Buy &lt;milk&gt;</a>')
+        self.assertContains(response, 'Buy milk too')
+
+    def test_scoped_to_one_list(self):
+        response = self.client.get(f'/lists/{self.list_.id}/search', {'q': 'milk'})
+        self.assertContains(response, 'Buy &lt;milk&gt;')
+        self.assertNotContains(response, 'Buy milk too')
+
+    def test_404s_for_missing_list(self):
+        response = self.client.get('/lists/999/search', {'q': 'milk'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_json_endpoint(self):
+        response = self.client.get(
+            f'/api/lists/{self.list_.id}/search', {'q': 'MILK'})
+        item = self.list_.item_set.get()
+        self.assertEqual(response.json(), {
+            'query': 'MILK',
+            'items': [{'id': item.id, 'list': self.list_.id, 'text': item.text}],
+        })
+
+
+class RebuildSearchIndexCommandTest(TestCase):
+
+    def test_rebuilds_index(self):
+        list_ = List.objects.create()
+        for n in range(3):
+            Item.objects.create(list=list_, text=f'item {n}')
+        out = StringIO()
+        call_command('rebuild_search_index', chunk_size=2, stdout=out)
+        self.assertIn('Indexed 3 items', out.getvalue())
+        self.assertEqual(len(search.search('item')), 3)
@@ -0,0 +1,45 @@
+from django.test import SimpleTestCase, TestCase
+from lists.models import Item, List
+from lists.tables import render_table, stream_table
+
+
+class RenderTableTest(SimpleTestCase):
+
+    def test_numbers_and_escapes_rows(self):
+        rows = [(1, '<b>bold</b> & "quoted"'), (2, "it's")]
+        self.assertEqual(render_table(7, rows, 0, None), (
+            '<table id="id_list_table" class="table">\n    \n'
+            '      <tr><td>1: &lt;b&gt;bold&lt;/b&gt; &amp; &quot;quoted&quot;'
+            '</td></tr>\n    \n'
+            '      <tr><td>2: it&#39;s</td></tr>\n    \n'
+            '  </table>\n  \n'
+        ))
+
+    def test_links_to_next_page(self):
+        rows = [(11, 'ünïcödé')]
+        self.assertEqual(render_table(7, rows, 100, 'after=11&start=101'), (
+            '<table id="id_list_table" class="table">\n    \n'
+            '      <tr><td>101: ünïcödé</td></tr>\n    \n'
+            '  </table>\n  \n'
+            '    <a id="id_load_more" href="?after=11&amp;start=101"\n'
+            '       data-url="/lists/7/items?after=11&amp;start=101">Load more</a>\n'
+            '  \n'
+        ))
+
+    def test_renders_empty_page(self):
+        self.assertEqual(
+            render_table(7, [], 0, None),
+            '<table id="id_list_table" class="table">\n    \n  </table>\n  \n')
+
+
+class StreamTableTest(TestCase):
+
+    def test_yields_one_string_per_chunk(self):
+        list_ = List.objects.create()
+        Item.objects.bulk_create(
+            Item(list=list_, text=f'item {n}') for n in range(5))
+        rows = list(Item.objects.filter(list=list_).values_list('id', 'text'))
+        with self.assertNumQueries(3):
+            chunks = list(stream_table(list_.id, chunk_size=2))
+        self.assertEqual(len(chunks), 3)
+        self.assertEqual(''.join(chunks), render_table(list_.id, rows, 0, None))
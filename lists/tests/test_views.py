@@ -1,6 +1,8 @@
-from django.test import TestCase
+from django.core.cache import caches
+from django.test import TestCase, override_settings
 from django.utils.html import escape
 from unittest import skip
+from accounts.models import Token
 from lists.models import Item, List
 from lists.forms import (
     ItemForm, ExistingListItemForm, EMPTY_ITEM_ERROR,
@@ -50,6 +52,40 @@ class NewListTest(TestCase):
         self.assertEqual(List.objects.count(), 0)
         self.assertEqual(Item.objects.count(), 0)
 
+    def test_can_start_a_list_with_many_items(self):
+        response = self.client.post(
+            '/lists/new', data={'text': ['one', 'two', 'three']})
+        list_ = List.objects.get()
+        self.assertRedirects(response, f'/lists/{list_.id}/')
+        self.assertEqual(
+            [item.text for item in list_.item_set.all()], ['one', 'two', 'three'])
+        self.assertEqual(List.objects.get().item_count, 3)
+
+    def test_can_start_a_list_with_more_items_than_one_insert_can_hold(self):
+        texts = [f'item {n}' for n in range(600)]
+        response = self.client.post('/lists/new', data={'text': texts})
+        list_ = List.objects.get()
+        self.assertRedirects(response, f'/lists/{list_.id}/')
+        self.assertEqual(list_.item_set.count(), 600)
+
+    def test_many_items_cost_a_constant_number_of_queries(self):
+        # savepoint, list insert, bulk item insert, list stats update, release
+        with self.assertNumQueries(5):
+            self.client.post(
+                '/lists/new', data={'text': [f'item {n}' for n in range(50)]})
+
+    def test_one_invalid_item_saves_nothing(self):
+        response = self.client.post('/lists/new', data={'text': ['one', '']})
+        self.assertTemplateUsed(response, 'home.html')
+        self.assertContains(response, escape(EMPTY_ITEM_ERROR))
+        self.assertEqual(List.objects.count(), 0)
+        self.assertEqual(Item.objects.count(), 0)
+
+    def test_repeated_items_are_rejected(self):
+        response = self.client.post('/lists/new', data={'text': ['one', 'one']})
+        self.assertContains(response, escape(DUPLICATE_ITEM_ERROR))
+        self.assertEqual(List.objects.count(), 0)
+
 
 class ListViewTest(TestCase):
 
@@ -149,3 +185,219 @@ class ListViewTest(TestCase):
         self.assertContains(response, expected_error)
         self.assertTemplateUsed(response, 'list.html')
         self.assertEqual(Item.objects.all().count(), 1)
+
+
+class ConditionalListViewTest(TestCase):
+
+    def setUp(self):
+        caches['lists'].clear()
+        # like a browser, hold the CSRF cookie from an earlier page
+        self.client.get('/')
+
+    def test_sends_etag_and_last_modified(self):
+        list_ = List.objects.create()
+        response = self.client.get(f'/lists/{list_.id}/')
+        self.assertTrue(response['ETag'].startswith(
+            List.objects.get(id=list_.id).etag[:-1] + '-'))
+        self.assertIn('Last-Modified', response)
+        self.assertIn('Cookie', response['Vary'])
+
+    def test_etag_without_csrf_cookie_is_the_lists(self):
+        list_ = List.objects.create()
+        self.client.cookies.clear()
+        response = self.client.get(f'/lists/{list_.id}/')
+        self.assertEqual(response['ETag'], List.objects.get(id=list_.id).etag)
+
+    def test_polling_without_cookies_gets_304(self):
+        list_ = List.objects.create()
+        self.client.cookies.clear()
+        etag = self.client.get(f'/lists/{list_.id}/')['ETag']
+        self.client.cookies.clear()
+        response = self.client.get(
+            f'/lists/{list_.id}/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_etag_changes_when_login_rotates_csrf_cookie(self):
+        list_ = List.objects.create()
+        etag = self.client.get(f'/lists/{list_.id}/')['ETag']
+        token = Token.objects.create(email='edith@example.com')
+        self.client.get(f'/accounts/login?token={token.uid}')
+        response = self.client.get(
+            f'/lists/{list_.id}/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_matching_etag_gets_304_without_querying_items(self):
+        list_ = List.objects.create()
+        Item.objects.create(list=list_, text='itemey1')
+        etag = self.client.get(f'/lists/{list_.id}/')['ETag']
+        caches['lists'].clear()
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                f'/lists/{list_.id}/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_matching_etag_from_cache_needs_no_queries(self):
+        list_ = List.objects.create()
+        etag = self.client.get(f'/lists/{list_.id}/')['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                f'/lists/{list_.id}/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_etag_changes_when_an_item_is_added(self):
+        list_ = List.objects.create()
+        etag = self.client.get(f'/lists/{list_.id}/')['ETag']
+        self.client.post(f'/lists/{list_.id}/', data={'text': 'new item'})
+        response = self.client.get(
+            f'/lists/{list_.id}/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertContains(response, 'new item')
+
+    def test_if_modified_since_without_cookies_gets_304(self):
+        list_ = List.objects.create()
+        self.client.cookies.clear()
+        last_modified = self.client.get(f'/lists/{list_.id}/')['Last-Modified']
+        self.client.cookies.clear()
+        response = self.client.get(
+            f'/lists/{list_.id}/', HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+    def test_if_modified_since_is_ignored_with_csrf_cookie(self):
+        list_ = List.objects.create()
+        last_modified = self.client.get(f'/lists/{list_.id}/')['Last-Modified']
+        response = self.client.get(
+            f'/lists/{list_.id}/', HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 200)
+
+
+@override_settings(LIST_PAGE_SIZE=2)
+class PaginatedListViewTest(TestCase):
+
+    def setUp(self):
+        caches['lists'].clear()
+        self.list_ = List.objects.create()
+        self.items = [
+            Item.objects.create(list=self.list_, text=f'itemey{n}')
+            for n in range(1, 6)
+        ]
+
+    def test_first_page_is_limited_to_page_size(self):
+        response = self.client.get(f'/lists/{self.list_.id}/')
+        self.assertContains(response, '1: itemey1')
+        self.assertContains(response, '2: itemey2')
+        self.assertNotContains(response, 'itemey3')
+
+    def test_next_page_keeps_numbering(self):
+        response = self.client.get(
+            f'/lists/{self.list_.id}/',
+            {'after': self.items[1].id, 'start': 2})
+        self.assertContains(response, '3: itemey3')
+        self.assertContains(response, '4: itemey4')
+        self.assertNotContains(response, 'itemey2')
+
+    def test_links_to_next_page(self):
+        response = self.client.get(f'/lists/{self.list_.id}/')
+        self.assertContains(
+            response, f'href="?after={self.items[1].id}&amp;start=2"')
+
+    def test_last_page_has_no_load_more_link(self):
+        response = self.client.get(
+            f'/lists/{self.list_.id}/',
+            {'after': self.items[3].id, 'start': 4})
+        self.assertContains(response, '5: itemey5')
+        self.assertNotContains(response, 'id_load_more')
+
+    def test_does_not_count_items(self):
+        with self.assertNumQueries(2):
+            self.client.get(f'/lists/{self.list_.id}/')
+
+    def test_invalid_cursor_is_a_bad_request(self):
+        response = self.client.get(f'/lists/{self.list_.id}/', {'after': 'x'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_load_more_json(self):
+        response = self.client.get(
+            f'/lists/{self.list_.id}/items',
+            {'after': self.items[1].id, 'start': 2})
+        self.assertEqual(response.json(), {
+            'items': [
+                {'id': self.items[2].id, 'number': 3, 'text': 'itemey3'},
+                {'id': self.items[3].id, 'number': 4, 'text': 'itemey4'},
+            ],
+            'next': f'/lists/{self.list_.id}/items'
+                    f'?after={self.items[3].id}&start=4',
+            'count': 5,
+        })
+
+    def test_load_more_json_last_page(self):
+        response = self.client.get(
+            f'/lists/{self.list_.id}/items',
+            {'after': self.items[3].id, 'start': 4})
+        self.assertIsNone(response.json()['next'])
+
+
+class ListViewPOSTQueriesTest(TestCase):
+
+    def test_adding_an_item_does_not_look_for_duplicates_first(self):
+        list_ = List.objects.create()
+        # list lookup, savepoint, insert, list stats update, release
+        with self.assertNumQueries(5):
+            self.client.post(f'/lists/{list_.id}/', data={'text': 'new'})
+        self.assertEqual(Item.objects.count(), 1)
+
+
+@override_settings(LIST_PAGE_SIZE=2)
+class StreamingListViewTest(TestCase):
+
+    def setUp(self):
+        self.list_ = List.objects.create()
+        for n in range(1, 6):
+            Item.objects.create(list=self.list_, text=f'itemey{n}')
+        self.client.get('/')  # for a CSRF cookie
+
+    def get_page(self, **extra):
+        response = self.client.get(f'/lists/{self.list_.id}/all', **extra)
+        content = b''.join(response.streaming_content).decode()
+        return response, content
+
+    def test_streams_every_item_on_one_page(self):
+        response, content = self.get_page()
+        self.assertTrue(response.streaming)
+        for n in range(1, 6):
+            self.assertIn(f'{n}: itemey{n}', content)
+        self.assertNotIn('id_load_more', content)
+
+    def test_renders_rest_of_list_page_around_table(self):
+        _, content = self.get_page()
+        self.assertIn(f'action="/lists/{self.list_.id}/"', content)
+        self.assertIn('csrfmiddlewaretoken', content)
+        self.assertLess(content.index('id_text'), content.index('id_list_table'))
+        self.assertTrue(content.rstrip().endswith('</html>'))
+
+    def test_escapes_item_text(self):
+        Item.objects.create(list=self.list_, text='<b>bold</b>')
+        _, content = self.get_page()
+        self.assertIn('6: &lt;b&gt;bold&lt;/b&gt;', content)
+
+    def test_answers_conditional_get(self):
+        response, _ = self.get_page()
+        response = self.client.get(
+            f'/lists/{self.list_.id}/all', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_new_csrf_cookie_gets_the_whole_page(self):
+        response, _ = self.get_page()
+        self.client.cookies.clear()
+        self.client.get('/')
+        response = self.client.get(
+            f'/lists/{self.list_.id}/all', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Cookie', response['Vary'])
+
+    def test_404s_for_missing_list(self):
+        response = self.client.get('/lists/999/all')
+        self.assertEqual(response.status_code, 404)
@@ -15,10 +15,16 @@ Including another URLconf
 """
 from django.conf.urls import url
 #from django.contrib import admin
-from lists import views
+from lists import api, views
 
 
 urlpatterns = [
     url(r'^new$', views.new_list, name='new_list'),
+    url(r'^search$', views.search_items, name='search'),
     url(r'^(\d+)/$', views.view_list, name='view_list'),
+    url(r'^(\d+)/all$', views.stream_list, name='stream_list'),
+    url(r'^(\d+)/search$', views.search_items, name='search_list'),
+    url(r'^(\d+)/items$', api.list_items, name='list_items'),
+    url(r'^(\d+)/items/bulk$', views.bulk_add_items, name='bulk_add_items'),
+    url(r'^(\d+)/export$', views.export_list, name='export_list'),
 ]
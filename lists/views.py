@@ -1,6 +1,26 @@
-from django.shortcuts import render, redirect
+import hashlib
+import itertools
+import json
+from calendar import timegm
+
+from django.conf import settings
+from django.http import (
+    HttpResponseBadRequest, JsonResponse, StreamingHttpResponse
+)
+from django.shortcuts import get_object_or_404, render, redirect
+from django.template.loader import render_to_string
+from django.utils.cache import get_conditional_response, patch_vary_headers
 from django.utils.html import escape
+from django.utils.http import http_date, urlencode
+from django.utils.safestring import mark_safe
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+from lists import cache as list_cache
+from lists import search
+from lists.bulk import create_list_with_items, import_items
+from lists.export import ndjson_lines
 from lists.models import Item, List
+from lists.tables import render_table, stream_table
 from lists.forms import (ItemForm, ExistingListItemForm,
     EMPTY_ITEM_ERROR
 )
@@ -10,19 +30,143 @@ from lists.forms import (ItemForm, ExistingListItemForm,
 def home_page(request):
     return render(request, 'home.html', {'form': ItemForm()})
 
+def get_cursor(query):
+    """Parse ?after=<item id>&start=<number of items before it>."""
+    after = int(query.get('after', 0))
+    start = int(query.get('start', 0))
+    if after < 0 or start < 0:
+        raise ValueError('cursor values must not be negative')
+    return after, start
+
+
+def item_page(list_id, after, start):
+    """Return up to LIST_PAGE_SIZE (id, text) rows with id > after, and the
+    query string for the following page (or None on the last page)."""
+    page_size = settings.LIST_PAGE_SIZE
+    rows = list(
+        Item.objects.filter(list_id=list_id, id__gt=after)
+        .values_list('id', 'text')[:page_size + 1])
+    if len(rows) <= page_size:
+        return rows, None
+    rows = rows[:page_size]
+    return rows, urlencode({'after': rows[-1][0], 'start': start + page_size})
+
+
+def list_validators(list_):
+    return list_.etag, timegm(list_.modified.utctimetuple())
+
+
+def page_validators(request, etag, last_modified):
+    """Return the ETag of the page sent to this request, and the time to
+    check If-Modified-Since against (None to ignore it).
+
+    The page's forms carry a token derived from the CSRF cookie, so a copy
+    rendered under an older cookie (one rotated at login, say) must not be
+    revalidated: when the request has the cookie, the ETag includes it and
+    If-Modified-Since, which cannot tell cookies apart, is ignored. Requests
+    without one (pollers, caches) are given a token no cached copy holds, so
+    for them the list's own validators stand.
+    """
+    cookie = request.COOKIES.get(settings.CSRF_COOKIE_NAME)
+    if cookie is None:
+        return etag, last_modified
+    digest = hashlib.sha256(cookie.encode()).hexdigest()
+    return '"%s-%s"' % (etag.strip('"'), digest[:16]), None
+
+
+def add_validators(response, etag, last_modified):
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    patch_vary_headers(response, ('Cookie',))
+    return response
+
+
 def view_list(request, list_id):
-    list_ = List.objects.get(id=list_id)
+    try:
+        after, start = get_cursor(request.GET)
+    except ValueError:
+        return HttpResponseBadRequest('Invalid page cursor')
+    page = f'{after}:{start}'
+    table, version = list_cache.get_table(list_id, page)
+    if table is None or request.method == 'POST':
+        list_ = List.objects.get(id=list_id)
+        etag, last_modified = list_validators(list_)
+    else:
+        # a cached table means the list exists, so skip the lookup
+        list_ = List(id=int(list_id))
+        etag, last_modified = table.etag, table.last_modified
     form = ExistingListItemForm(for_list=list_)
     if request.method == 'POST':
-        form = ExistingListItemForm(for_list=list_, data=request.POST)
-        if form.is_valid():
-            form.save()
+        form = ExistingListItemForm(
+            for_list=list_, data=request.POST, defer_unique=True)
+        if form.is_valid() and form.save() is not None:
             return redirect(list_)
-    return render(request, 'list.html', {'list': list_, "form": form})
+    else:
+        response_etag, since = page_validators(request, etag, last_modified)
+        response = get_conditional_response(
+            request, etag=response_etag, last_modified=since)
+        if response is not None:
+            return add_validators(response, response_etag, last_modified)
+    if table is None:
+        rows, next_page = item_page(list_.id, after, start)
+        html = render_table(list_.id, rows, start, next_page)
+        table = list_cache.ListTable(html, etag, last_modified)
+        list_cache.set_table(list_id, version, table, page)
+    response = render(request, 'list.html',
+                      {'list': list_, "form": form, 'table': table.html})
+    if request.method == 'GET':
+        add_validators(response, response_etag, last_modified)
+    return response
+
+
+TABLE_PLACEHOLDER = '<!-- list table -->'
+
 
+def stream_list(request, list_id):
+    """The whole list on one page, streamed: everything before the table is
+    sent at once, then the rows follow in chunks as they are read."""
+    list_ = get_object_or_404(List, id=list_id)
+    etag, last_modified = list_validators(list_)
+    etag, since = page_validators(request, etag, last_modified)
+    response = get_conditional_response(
+        request, etag=etag, last_modified=since)
+    if response is not None:
+        return add_validators(response, etag, last_modified)
+    page = render_to_string('list.html', {
+        'list': list_,
+        'form': ExistingListItemForm(for_list=list_),
+        'table': mark_safe(TABLE_PLACEHOLDER),
+    }, request=request)
+    head, tail = page.split(TABLE_PLACEHOLDER, 1)
+    response = StreamingHttpResponse(
+        itertools.chain([head], stream_table(list_.id), [tail]))
+    # stop nginx buffering the response before passing it on
+    response['X-Accel-Buffering'] = 'no'
+    return add_validators(response, etag, last_modified)
+
+
+def search_items(request, list_id=None):
+    if list_id is not None:
+        list_id = get_object_or_404(List, id=list_id).id
+    query = request.GET.get('q', '')
+    return render(request, 'search.html', {
+        'form': ItemForm(),
+        'query': query,
+        'results': search.search(query, list_id),
+    })
 
 
 def new_list(request):
+    texts = request.POST.getlist('text')
+    if len(texts) > 1:
+        list_, errors = create_list_with_items(texts)
+        if list_ is not None:
+            return redirect(list_)
+        # show the first rejected text with its error
+        form = ItemForm(data={'text': errors[0]['text']})
+        if form.is_valid():  # a duplicate within the submission
+            form.add_error('text', errors[0]['error'])
+        return render(request, 'home.html', {'form': form})
     form = ItemForm(request.POST)
     if form.is_valid():
         list_1 = List.objects.create()
@@ -32,3 +176,36 @@ def new_list(request):
         return render(request, 'home.html', {'form': form })
 
 
+@csrf_exempt
+@require_POST
+def bulk_add_items(request, list_id):
+    list_ = get_object_or_404(List, id=list_id)
+    body = request.body.decode(request.encoding or 'utf-8')
+    if request.content_type == 'application/json':
+        try:
+            lines = json.loads(body)
+        except ValueError:
+            return HttpResponseBadRequest('Invalid JSON')
+        if isinstance(lines, dict):
+            lines = lines.get('items')
+        if not isinstance(lines, list) or not all(
+                isinstance(line, str) for line in lines):
+            return HttpResponseBadRequest('Expected a list of item texts')
+    else:
+        lines = body.splitlines()
+    if not lines:
+        # an empty import is rejected like a single blank line
+        lines = ['']
+    created, errors = import_items(list_, lines)
+    return JsonResponse({'created': created, 'errors': errors},
+                        status=200 if created else 400)
+
+
+def export_list(request, list_id):
+    list_ = get_object_or_404(List, id=list_id)
+    try:
+        since_id = int(request.GET.get('since_id', 0))
+    except ValueError:
+        return HttpResponseBadRequest('since_id must be an integer')
+    return StreamingHttpResponse(
+        ndjson_lines(list_.id, since_id), content_type='application/x-ndjson')
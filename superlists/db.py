@@ -0,0 +1,55 @@
+"""Environment-driven database settings.
+
+DJANGO_DB_ENGINE=postgresql switches to PostgreSQL, configured by
+DJANGO_DB_NAME, DJANGO_DB_USER, DJANGO_DB_PASSWORD, DJANGO_DB_HOST and
+DJANGO_DB_PORT. DJANGO_DB_CONN_MAX_AGE sets how many seconds a worker keeps
+its connection open between requests (0 closes it after every request).
+Otherwise SQLite is used, at DJANGO_DB_PATH if given, through the
+superlists.sqlite backend, and every new connection is tuned for
+concurrent gunicorn workers.
+"""
+import os
+
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+CONN_MAX_AGE = 600
+
+SQLITE_PRAGMAS = (
+    # readers no longer block the writer, or the writer readers
+    'PRAGMA journal_mode=WAL',
+    # WAL keeps the database consistent at NORMAL; only fsync on checkpoint
+    'PRAGMA synchronous=NORMAL',
+    # wait for the write lock instead of failing with "database is locked"
+    'PRAGMA busy_timeout=5000',
+    'PRAGMA mmap_size=268435456',
+)
+
+
+def database_from_env(base_dir):
+    conn_max_age = int(os.environ.get('DJANGO_DB_CONN_MAX_AGE', CONN_MAX_AGE))
+    if os.environ.get('DJANGO_DB_ENGINE') == 'postgresql':
+        return {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ['DJANGO_DB_NAME'],
+            'USER': os.environ.get('DJANGO_DB_USER', ''),
+            'PASSWORD': os.environ.get('DJANGO_DB_PASSWORD', ''),
+            'HOST': os.environ.get('DJANGO_DB_HOST', ''),
+            'PORT': os.environ.get('DJANGO_DB_PORT', ''),
+            'CONN_MAX_AGE': conn_max_age,
+        }
+    return {
+        'ENGINE': 'superlists.sqlite',
+        'NAME': os.environ.get(
+            'DJANGO_DB_PATH', os.path.join(base_dir, 'db.sqlite3')),
+        'CONN_MAX_AGE': conn_max_age,
+    }
+
+
+@receiver(connection_created)
+def tune_sqlite(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
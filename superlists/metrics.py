@@ -0,0 +1,225 @@
+"""Per-request timing and query counts, exported for Prometheus.
+
+Enabled by setting DJANGO_METRICS in the environment. MetricsMiddleware
+then times every request, counts and times its database queries and times
+template rendering (through InstrumentedDjangoTemplates). Each response gets
+a Server-Timing header, and the numbers are aggregated per view into the
+histograms served at /metrics. Streamed responses are timed until their
+body has been sent, so they get no Server-Timing header. /metrics only
+answers METRICS_ALLOWED_IPS. When disabled the middleware removes itself
+from the stack and /metrics returns 404.
+"""
+import bisect
+import threading
+from time import perf_counter
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.utils import CursorWrapper
+from django.http import Http404, HttpResponse
+from django.template.backends.django import DjangoTemplates, Template
+
+DURATION_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+_local = threading.local()
+
+
+class RequestStats:
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.template_time = 0.0
+
+
+class Histogram:
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Registry:
+
+    METRICS = (
+        ('request_duration_seconds', 'Total time spent handling the request.',
+         DURATION_BUCKETS),
+        ('db_duration_seconds', 'Time spent executing database queries.',
+         DURATION_BUCKETS),
+        ('template_duration_seconds', 'Time spent rendering templates.',
+         DURATION_BUCKETS),
+        ('db_queries', 'Database queries executed per request.', QUERY_BUCKETS),
+    )
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.histograms = {}
+
+    def observe(self, view, duration, stats):
+        values = (duration, stats.db_time, stats.template_time, stats.queries)
+        with self.lock:
+            for (name, _, buckets), value in zip(self.METRICS, values):
+                key = (name, view)
+                if key not in self.histograms:
+                    self.histograms[key] = Histogram(buckets)
+                self.histograms[key].observe(value)
+
+    def clear(self):
+        with self.lock:
+            self.histograms.clear()
+
+    def exposition(self):
+        lines = []
+        with self.lock:
+            for name, help_text, buckets in self.METRICS:
+                metric = f'superlists_{name}'
+                lines.append(f'# HELP {metric} {help_text}')
+                lines.append(f'# TYPE {metric} histogram')
+                for (key, view), histogram in sorted(self.histograms.items()):
+                    if key != name:
+                        continue
+                    cumulative = 0
+                    for bound, count in zip(
+                            buckets + ('+Inf',), histogram.counts):
+                        cumulative += count
+                        lines.append(
+                            f'{metric}_bucket{{view="{view}",le="{bound}"}} '
+                            f'{cumulative}')
+                    lines.append(f'{metric}_sum{{view="{view}"}} {histogram.sum}')
+                    lines.append(
+                        f'{metric}_count{{view="{view}"}} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+
+class TimedCursorWrapper(CursorWrapper):
+
+    def __init__(self, cursor, db, stats):
+        super().__init__(cursor, db)
+        self.stats = stats
+
+    def _timed(self, method, *args):
+        start = perf_counter()
+        try:
+            return method(*args)
+        finally:
+            self.stats.db_time += perf_counter() - start
+            self.stats.queries += 1
+
+    def execute(self, sql, params=None):
+        return self._timed(self.cursor.execute, sql, params)
+
+    def executemany(self, sql, param_list):
+        return self._timed(self.cursor.executemany, sql, param_list)
+
+    def callproc(self, procname, params=None):
+        return self._timed(self.cursor.callproc, procname, params)
+
+
+def _instrument(connection):
+    """Wrap the connection's cursor factories, keeping any debug logging."""
+    def timed(make):
+        def make_timed_cursor(cursor):
+            cursor = make(cursor)
+            stats = getattr(_local, 'stats', None)
+            if stats is None:
+                return cursor
+            return TimedCursorWrapper(cursor, connection, stats)
+        return make_timed_cursor
+    connection.make_cursor = timed(connection.make_cursor)
+    connection.make_debug_cursor = timed(connection.make_debug_cursor)
+    connection._metrics_instrumented = True
+
+
+class TimedTemplate(Template):
+
+    def render(self, context=None, request=None):
+        stats = getattr(_local, 'stats', None)
+        if stats is None:
+            return super().render(context, request)
+        start = perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            stats.template_time += perf_counter() - start
+
+
+class InstrumentedDjangoTemplates(DjangoTemplates):
+
+    def from_string(self, template_code):
+        return TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        return TimedTemplate(super().get_template(template_name).template, self)
+
+
+class MetricsMiddleware:
+
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        for connection in connections.all():
+            if not getattr(connection, '_metrics_instrumented', False):
+                _instrument(connection)
+        stats = _local.stats = RequestStats()
+        start = perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _local.stats = None
+
+        match = request.resolver_match
+        view = match.url_name if match else 'unmatched'
+        if view == 'metrics':
+            return response
+        if response.streaming:
+            response.streaming_content = self.timed_stream(
+                response.streaming_content, view, start, stats)
+            return response
+        duration = perf_counter() - start
+        registry.observe(view, duration, stats)
+        response['Server-Timing'] = (
+            f'db;dur={stats.db_time * 1000:.2f};desc="{stats.queries} queries", '
+            f'tpl;dur={stats.template_time * 1000:.2f}, '
+            f'total;dur={duration * 1000:.2f}'
+        )
+        return response
+
+    def timed_stream(self, content, view, start, stats):
+        """Yield content's chunks, counting the queries run to produce them,
+        and record the request once the last one has been sent."""
+        chunks = iter(content)
+        try:
+            while True:
+                _local.stats = stats
+                try:
+                    chunk = next(chunks)
+                except StopIteration:
+                    return
+                finally:
+                    _local.stats = None
+                yield chunk
+        finally:
+            registry.observe(view, perf_counter() - start, stats)
+
+
+def metrics(request):
+    if (not settings.METRICS_ENABLED
+            or request.META.get('REMOTE_ADDR') not in settings.METRICS_ALLOWED_IPS):
+        raise Http404
+    return HttpResponse(
+        registry.exposition(), content_type='text/plain; version=0.0.4')
@@ -12,6 +12,8 @@ https://docs.djangoproject.com/en/1.11/ref/settings/
 
 import os
 
+from superlists.db import database_from_env
+
 # Build paths inside the project like this: os.path.join(BASE_DIR, ...)
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
@@ -29,7 +31,7 @@ DEBUG = True
 ALLOWED_HOSTS = ['*']
 '''
 if 'DJANGO_DEBUG_FALSE' in os.environ:
-    DEBUG = True
+    DEBUG = False
     SECRET_KEY = os.environ['DJANGO_SECRET_KEY']
     ALLOWED_HOSTS = [os.environ['SITENAME']]
 else:
@@ -40,6 +42,12 @@ else:
 
 # Application definition
 
+# The lean profile, for read-heavy deployments, drops the messages
+# framework and clickjacking middleware (set X-Frame-Options in nginx
+# instead), runs only the context processors the templates use (none) and
+# always uses the cached template loader.
+LEAN = 'DJANGO_LEAN' in os.environ
+
 INSTALLED_APPS = [
     #'django.contrib.admin',
     'django.contrib.auth',
@@ -50,8 +58,18 @@ INSTALLED_APPS = [
     'lists',
     'accounts',
 ]
+if LEAN:
+    INSTALLED_APPS.remove('django.contrib.messages')
+
+# Per-view timing and query counts, served at /metrics (superlists/metrics.py)
+METRICS_ENABLED = 'DJANGO_METRICS' in os.environ
+# Addresses /metrics answers; everyone else gets a 404. Behind nginx every
+# request comes from loopback, so nginx must guard the location as well.
+METRICS_ALLOWED_IPS = os.environ.get(
+    'DJANGO_METRICS_ALLOWED_IPS', '127.0.0.1,::1').split(',')
 
 MIDDLEWARE = [
+    'superlists.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -60,24 +78,35 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
+if LEAN:
+    MIDDLEWARE = MIDDLEWARE[:-2]
 
 ROOT_URLCONF = 'superlists.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': ('superlists.metrics.InstrumentedDjangoTemplates'
+                    if METRICS_ENABLED else
+                    'django.template.backends.django.DjangoTemplates'),
         'DIRS': [],
-        'APP_DIRS': True,
         'OPTIONS': {
-            'context_processors': [
+            'context_processors': [] if LEAN else [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
             ],
+            'loaders': ['django.template.loaders.app_directories.Loader'],
         },
     },
 ]
+# Outside development templates are parsed once per worker, at boot
+# (superlists/wsgi.py), instead of being re-read on every request.
+if LEAN or not DEBUG:
+    TEMPLATES[0]['OPTIONS']['loaders'] = [
+        ('django.template.loaders.cached.Loader',
+         TEMPLATES[0]['OPTIONS']['loaders']),
+    ]
 
 WSGI_APPLICATION = 'superlists.wsgi.application'
 
@@ -85,17 +114,55 @@ WSGI_APPLICATION = 'superlists.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/1.11/ref/settings/#databases
 
+# See superlists/db.py for the DJANGO_DB_* environment variables.
+
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+    'default': database_from_env(BASE_DIR),
+}
+
+
+# Caches
+# https://docs.djangoproject.com/en/1.11/topics/cache/
+# Rendered list tables live in the 'lists' cache. Point LIST_CACHE_DIR at a
+# shared directory so every gunicorn worker on the box reuses the same pages
+# and sees the others' writes at once. The in-process default cannot see
+# writes from other processes (workers, manage.py import_items), so its
+# entries expire after LIST_CACHE_TIMEOUT seconds to bound the staleness.
+LIST_CACHE_TIMEOUT = 60
+
+if 'LIST_CACHE_DIR' in os.environ:
+    LIST_CACHE = {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ['LIST_CACHE_DIR'],
+        'TIMEOUT': None,
+        'OPTIONS': {'MAX_ENTRIES': 10000},
     }
+else:
+    LIST_CACHE = {
+        'BACKEND': 'lists.cache.LRUCache',
+        'TIMEOUT': LIST_CACHE_TIMEOUT,
+        'OPTIONS': {'MAX_ENTRIES': 1000},
+    }
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'lists': LIST_CACHE,
 }
 
+# Items shown per page of a list; further pages are fetched by cursor.
+LIST_PAGE_SIZE = 100
+
 
 # Password validation
 # https://docs.djangoproject.com/en/1.11/ref/settings/#auth-password-validators
 AUTH_USER_MODEL = 'accounts.User'
+AUTHENTICATION_BACKENDS = [
+    'accounts.authentication.PasswordlessAuthenticationBackend',
+]
+# seconds a logged-in user is cached for between requests
+USER_CACHE_TIMEOUT = 5 * 60
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -113,6 +180,44 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Sessions
+# https://docs.djangoproject.com/en/1.11/topics/http/sessions/
+# DJANGO_SESSION_ENGINE picks the store: 'db' (default), 'cached_db' to read
+# sessions from the cache, or 'signed_cookies' to keep them out of the
+# database entirely. The db engines need manage.py clearsessions run
+# regularly (deploy_tools/clearsessions-systemd.template.timer).
+
+SESSION_ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}
+SESSION_ENGINE = SESSION_ENGINES[os.environ.get('DJANGO_SESSION_ENGINE', 'db')]
+
+
+# Login emails
+# Sent from background threads in batches (accounts/mail.py). Without an
+# EMAIL_HOST they are written to files in sent_emails/ instead.
+
+if 'EMAIL_HOST' in os.environ:
+    EMAIL_HOST = os.environ['EMAIL_HOST']
+    EMAIL_PORT = int(os.environ.get('EMAIL_PORT', 25))
+    EMAIL_HOST_USER = os.environ.get('EMAIL_HOST_USER', '')
+    EMAIL_HOST_PASSWORD = os.environ.get('EMAIL_PASSWORD', '')
+    EMAIL_USE_TLS = 'EMAIL_USE_TLS' in os.environ
+else:
+    EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+    EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
+
+DEFAULT_FROM_EMAIL = 'noreply@superlists'
+LOGIN_MAIL_ASYNC = True
+LOGIN_MAIL_WORKERS = 2
+LOGIN_MAIL_QUEUE_SIZE = 1000
+LOGIN_MAIL_BATCH_SIZE = 50
+# seconds a login link stays valid; manage.py purge_tokens deletes older ones
+LOGIN_TOKEN_MAX_AGE = 60 * 60
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/1.11/topics/i18n/
 
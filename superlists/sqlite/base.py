@@ -0,0 +1,16 @@
+"""SQLite backend that takes the write lock when a transaction starts.
+
+Django opens transactions with a deferred BEGIN, so the write lock is
+only requested by the first write. If that statement has already read
+the database - the FTS5 triggers behind lists.search read the index
+config first - SQLite cannot wait for a concurrent writer without
+invalidating what was read, and fails at once with "database is locked"
+instead of honouring busy_timeout. BEGIN IMMEDIATE waits up front.
+"""
+from django.db.backends.sqlite3 import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    def _start_transaction_under_autocommit(self):
+        self.cursor().execute('BEGIN IMMEDIATE')
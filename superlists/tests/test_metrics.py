@@ -0,0 +1,83 @@
+from django.template import engines
+from django.test import TestCase, override_settings
+from lists.models import Item, List
+from superlists.metrics import InstrumentedDjangoTemplates, registry
+
+METRICS_TEMPLATES = [{
+    'BACKEND': 'superlists.metrics.InstrumentedDjangoTemplates',
+    'APP_DIRS': True,
+    'OPTIONS': {'context_processors': ['django.template.context_processors.request']},
+}]
+
+
+@override_settings(METRICS_ENABLED=True, TEMPLATES=METRICS_TEMPLATES)
+class MetricsMiddlewareTest(TestCase):
+
+    def setUp(self):
+        registry.clear()
+
+    def test_adds_server_timing_header(self):
+        list_ = List.objects.create()
+        Item.objects.create(list=list_, text='itemey1')
+        response = self.client.post(f'/lists/{list_.id}/', data={'text': 'x'})
+        self.assertRegex(
+            response['Server-Timing'],
+            r'^db;dur=[\d.]+;desc="\d+ queries", tpl;dur=[\d.]+, total;dur=[\d.]+$')
+
+    def test_counts_queries_per_view(self):
+        list_ = List.objects.create()
+        self.client.post(f'/lists/{list_.id}/', data={'text': 'x'})
+        response = self.client.get('/metrics')
+        self.assertContains(
+            response, 'superlists_db_queries_count{view="view_list"} 1')
+        self.assertContains(
+            response, 'superlists_db_queries_sum{view="view_list"} 5')
+
+    def test_times_template_rendering(self):
+        self.client.get('/')
+        self.assertIsInstance(engines.all()[0], InstrumentedDjangoTemplates)
+        response = self.client.get('/metrics')
+        self.assertContains(response, '# TYPE superlists_template_duration_seconds histogram')
+        self.assertContains(
+            response, 'superlists_template_duration_seconds_count{view="home"} 1')
+        self.assertNotContains(response, 'view="metrics"')
+
+    def test_times_streamed_responses_until_sent(self):
+        list_ = List.objects.create()
+        Item.objects.create(list=list_, text='itemey1')
+        response = self.client.get(f'/lists/{list_.id}/all')
+        self.assertNotIn('Server-Timing', response)
+        self.assertNotContains(self.client.get('/metrics'), 'view="stream_list"')
+        b''.join(response.streaming_content)
+        metrics = self.client.get('/metrics')
+        self.assertContains(
+            metrics, 'superlists_request_duration_seconds_count{view="stream_list"} 1')
+        # the rows are read while the body is sent, and counted
+        self.assertRegex(
+            metrics.content.decode(),
+            r'superlists_db_queries_sum\{view="stream_list"\} [2-9]')
+
+    @override_settings(METRICS_ALLOWED_IPS=['10.0.0.5'])
+    def test_metrics_endpoint_only_answers_allowed_addresses(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 404)
+        response = self.client.get('/metrics', REMOTE_ADDR='10.0.0.5')
+        self.assertEqual(response.status_code, 200)
+
+    def test_histogram_buckets_are_cumulative(self):
+        self.client.get('/')
+        self.client.get('/')
+        response = self.client.get('/metrics')
+        self.assertContains(
+            response, 'superlists_request_duration_seconds_bucket{view="home",le="+Inf"} 2')
+
+
+@override_settings(METRICS_ENABLED=False)
+class MetricsDisabledTest(TestCase):
+
+    def test_no_server_timing_header(self):
+        response = self.client.get('/')
+        self.assertNotIn('Server-Timing', response)
+
+    def test_metrics_endpoint_is_hidden(self):
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,35 @@
+from django.conf import settings
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from accounts.models import Token
+
+
+class AnonymousSessionTest(TestCase):
+
+    def assertNoSessionWrites(self, response, queries):
+        self.assertNotIn(settings.SESSION_COOKIE_NAME, response.cookies)
+        self.assertFalse(
+            [q for q in queries if 'django_session' in q['sql']])
+
+    def test_home_page_does_not_touch_session(self):
+        for engine in settings.SESSION_ENGINES.values():
+            with self.subTest(engine=engine), override_settings(
+                    SESSION_ENGINE=engine):
+                with CaptureQueriesContext(connection) as queries:
+                    response = self.client.get('/')
+                self.assertNoSessionWrites(response, queries)
+
+
+@override_settings(SESSION_ENGINE=settings.SESSION_ENGINES['signed_cookies'])
+class SignedCookieSessionTest(TestCase):
+
+    def test_login_keeps_session_out_of_database(self):
+        token = Token.objects.create(email='edith@example.com')
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(f'/accounts/login?token={token.uid}')
+            response = self.client.get('/')
+            email = response.wsgi_request.user.email
+        self.assertEqual(email, 'edith@example.com')
+        self.assertFalse(
+            [q for q in queries if 'django_session' in q['sql']])
@@ -0,0 +1,53 @@
+import importlib.util
+import os
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+from lists.models import List
+
+
+def load_settings(**environ):
+    spec = importlib.util.spec_from_file_location(
+        'profile_settings', os.path.join(os.path.dirname(__file__), '..', 'settings.py'))
+    module = importlib.util.module_from_spec(spec)
+    with patch.dict(os.environ, environ):
+        spec.loader.exec_module(module)
+    return module
+
+
+LEAN = load_settings(DJANGO_LEAN='1')
+
+
+class LeanProfileTest(TestCase):
+
+    def test_strips_messages_and_clickjacking(self):
+        self.assertNotIn('django.contrib.messages', LEAN.INSTALLED_APPS)
+        self.assertFalse([m for m in LEAN.MIDDLEWARE
+                          if 'messages' in m or 'clickjacking' in m])
+
+    def test_uses_cached_loader_without_context_processors(self):
+        options = LEAN.TEMPLATES[0]['OPTIONS']
+        self.assertEqual(options['context_processors'], [])
+        self.assertEqual(
+            options['loaders'][0][0], 'django.template.loaders.cached.Loader')
+
+    @override_settings(MIDDLEWARE=LEAN.MIDDLEWARE, TEMPLATES=LEAN.TEMPLATES)
+    def test_pages_render_the_same(self):
+        list_ = List.objects.create()
+        self.client.post(f'/lists/{list_.id}/', data={'text': 'itemey'})
+        self.assertContains(self.client.get('/'), 'csrfmiddlewaretoken')
+        self.assertContains(self.client.get(f'/lists/{list_.id}/'), '1: itemey')
+
+
+class ProductionProfileTest(TestCase):
+
+    def setUp(self):
+        self.settings = load_settings(
+            DJANGO_DEBUG_FALSE='1', DJANGO_SECRET_KEY='key', SITENAME='example.com')
+
+    def test_debug_is_off(self):
+        self.assertFalse(self.settings.DEBUG)
+
+    def test_uses_cached_loader(self):
+        loaders = self.settings.TEMPLATES[0]['OPTIONS']['loaders']
+        self.assertEqual(loaders[0][0], 'django.template.loaders.cached.Loader')
@@ -0,0 +1,23 @@
+from django.template import engines
+from django.test import SimpleTestCase, override_settings
+from superlists.warmup import compile_templates
+
+CACHED_TEMPLATES = [{
+    'BACKEND': 'django.template.backends.django.DjangoTemplates',
+    'OPTIONS': {
+        'loaders': [('django.template.loaders.cached.Loader', [
+            'django.template.loaders.app_directories.Loader',
+        ])],
+    },
+}]
+
+
+@override_settings(TEMPLATES=CACHED_TEMPLATES)
+class CompileTemplatesTest(SimpleTestCase):
+
+    def test_fills_cached_loader_with_lists_templates(self):
+        self.assertEqual(compile_templates(), 4)
+        loader = engines.all()[0].engine.template_loaders[0]
+        self.assertEqual(
+            sorted(key for key in loader.get_template_cache),
+            ['base.html', 'home.html', 'list.html', 'search.html'])
@@ -15,11 +15,17 @@ Including another URLconf
 """
 from django.conf.urls import url, include
 #from django.contrib import admin
+from accounts import urls as accounts_urls
+from lists import api_urls as lists_api_urls
 from lists import urls as lists_urls
 from lists import views as lists_views
+from superlists import metrics
 
 
 urlpatterns = [
     url(r'^$', lists_views.home_page, name='home'),
     url(r'^lists/', include(lists_urls)),
+    url(r'^api/lists/', include(lists_api_urls)),
+    url(r'^accounts/', include(accounts_urls)),
+    url(r'^metrics$', metrics.metrics, name='metrics'),
 ]
@@ -0,0 +1,23 @@
+import os
+
+from django.apps import apps
+from django.template import engines
+
+WARM_APPS = ('lists',)
+
+
+def compile_templates(app_labels=WARM_APPS):
+    """Load every template of the given apps through each engine, so a
+    cached loader holds them compiled before the first request."""
+    names = []
+    for label in app_labels:
+        template_dir = os.path.join(apps.get_app_config(label).path, 'templates')
+        for root, _, files in os.walk(template_dir):
+            names.extend(
+                os.path.relpath(os.path.join(root, name), template_dir)
+                for name in files if name.endswith('.html')
+            )
+    for engine in engines.all():
+        for name in sorted(names):
+            engine.get_template(name)
+    return len(names)
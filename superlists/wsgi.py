@@ -13,6 +13,8 @@ from django.core.wsgi import get_wsgi_application
 from django.conf import settings
 from django.contrib.staticfiles.handlers import StaticFilesHandler
 
+from superlists.warmup import compile_templates
+
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "superlists.settings")
 '''if settings.DEBUG:
     application = StaticFilesHandler(get_wsgi_application())
@@ -20,4 +22,4 @@ else:
     application = get_wsgi_application()
 '''
 application = get_wsgi_application()
-
+compile_templates()